@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Experience League release page parser
+Records release pages once, then times parsing them offline
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from bs4 import BeautifulSoup
+from scrapers import AdobeReleasesScraper
+
+DEFAULT_PAGES_DIR = Path(__file__).parent / 'recorded_pages'
+VERSIONS_URL = 'https://experienceleague.adobe.com/en/docs/commerce-operations/release/versions'
+
+
+def record_pages(pages_dir, versions_url, product):
+    """Fetch the versions page and every release document it links to"""
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    scraper = AdobeReleasesScraper(pages_dir)
+    
+    soup = scraper.fetch_page(versions_url)
+    if not soup:
+        sys.exit(1)
+    
+    releases = scraper.extract_releases_from_versions_page(soup, product)
+    documents = scraper.group_releases_by_document(releases)
+    
+    index = []
+    for i, (document_url, document_releases) in enumerate(documents.items()):
+        document_soup = scraper.fetch_page(document_url)
+        if not document_soup:
+            continue
+        filename = f"page-{i:03d}.html"
+        (pages_dir / filename).write_text(str(document_soup), encoding='utf-8')
+        index.append({'file': filename, 'url': document_url, 'releases': document_releases})
+        print(f"   ✓ Recorded {document_url}")
+    
+    with open(pages_dir / 'index.json', 'w') as f:
+        json.dump(index, f, indent=2)
+    print(f"💾 Recorded {len(index)} documents to {pages_dir}")
+
+
+def run_benchmark(pages_dir, rounds):
+    """Time soup construction, a bare full-tree walk and release parsing per document"""
+    index_file = pages_dir / 'index.json'
+    if not index_file.exists():
+        print(f"❌ No recorded pages in {pages_dir} (run with --record first)")
+        sys.exit(1)
+    
+    with open(index_file, 'r') as f:
+        index = json.load(f)
+    
+    scraper = AdobeReleasesScraper.__new__(AdobeReleasesScraper)
+    documents = [((pages_dir / entry['file']).read_text(encoding='utf-8'), entry['releases']) for entry in index]
+    release_count = sum(len(releases) for _, releases in documents)
+    
+    timings = {'soup': 0.0, 'walk': 0.0, 'parse': 0.0}
+    for _ in range(rounds):
+        for html, releases in documents:
+            start = time.perf_counter()
+            soup = BeautifulSoup(html, 'html.parser')
+            timings['soup'] += time.perf_counter() - start
+            
+            # Reference cost: one bare traversal of every tag in the tree
+            start = time.perf_counter()
+            soup.find_all()
+            timings['walk'] += time.perf_counter() - start
+            
+            start = time.perf_counter()
+            for release in releases:
+                release_soup = soup
+                if release.get('fragment'):
+                    release_soup = scraper.slice_release_section(soup, release['fragment'])
+                scraper.parse_release_notes(release_soup, release)
+            timings['parse'] += time.perf_counter() - start
+    
+    print(f"📊 {len(documents)} documents, {release_count} releases, {rounds} rounds")
+    print(f"   BeautifulSoup construction: {timings['soup'] / rounds * 1000:8.1f} ms/sweep")
+    print(f"   Bare full-tree walk:        {timings['walk'] / rounds * 1000:8.1f} ms/sweep")
+    print(f"   parse_release_notes:        {timings['parse'] / rounds * 1000:8.1f} ms/sweep")
+    print(f"   Parse cost in tree walks:   {timings['parse'] / max(timings['walk'], 1e-9):8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark release page parsing over recorded pages')
+    parser.add_argument('--record', action='store_true', help='Fetch and record release pages before benchmarking')
+    parser.add_argument('--pages-dir', type=Path, default=DEFAULT_PAGES_DIR, help='Directory of recorded pages')
+    parser.add_argument('--url', default=VERSIONS_URL, help='Versions page to record from')
+    parser.add_argument('--product', default='adobe-commerce', help='Product name for release IDs')
+    parser.add_argument('--rounds', type=int, default=5, help='Number of timed sweeps')
+    
+    args = parser.parse_args()
+    
+    if args.record:
+        record_pages(args.pages_dir, args.url, args.product)
+    
+    run_benchmark(args.pages_dir, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
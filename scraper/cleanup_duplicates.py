@@ -10,7 +10,9 @@ import requests
 import json
 from collections import defaultdict
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
+from micropub import iter_source_posts
 
 # Load environment variables
 load_dotenv()
@@ -21,6 +23,11 @@ class DuplicateCleanup:
         self.api_url = os.getenv('MICROBLOG_API_URL', 'https://micro.blog/micropub')
         self.token = os.getenv('MICROBLOG_TOKEN')
         self.feed_url = 'https://adobedigest.com/feed.json'
+        self.session = requests.Session()
+        # Progress of an API scan, for --resume: a small cursor plus an
+        # append-only log of the indexed posts (one JSON line per post)
+        self.cursor_file = Path(__file__).parent / 'cleanup_cursor.json'
+        self.index_file = Path(__file__).parent / 'cleanup_index.jsonl'
         
         if not self.token:
             raise ValueError("MICROBLOG_TOKEN not set in environment")
@@ -46,76 +53,135 @@ class DuplicateCleanup:
             print(f"❌ Error fetching feed: {e}")
             return []
     
-    def get_all_posts_from_api(self):
-        """Fetch ALL posts from Micro.blog via Micropub source query"""
+    def load_cursor(self):
+        """Saved scan position, or None"""
+        if not self.cursor_file.exists():
+            return None
         try:
-            headers = {
-                'Authorization': f'Bearer {self.token}',
-            }
-            
-            # Micropub query endpoint to get all posts
-            params = {
-                'q': 'source',
-                'limit': 1000  # Get up to 1000 posts
-            }
-            
-            response = requests.get(
-                self.api_url,
-                headers=headers,
-                params=params,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                posts = []
-                
-                # Extract posts from response
-                items = data.get('items', [])
-                for item in items:
-                    # Micropub source returns posts with these properties
-                    # All values are arrays in Micropub format
-                    props = item.get('properties', {})
-                    
-                    # Extract URL from properties.url array
-                    url_array = props.get('url', [])
-                    url = url_array[0] if url_array else ''
-                    
-                    # Extract title from properties.name array
-                    name_array = props.get('name', [])
-                    title = name_array[0] if name_array else ''
-                    
-                    # Extract published date from properties.published array
-                    published_array = props.get('published', [])
-                    pub_date = published_array[0] if published_array else ''
-                    
-                    posts.append({
-                        'url': url,
-                        'title': title,
-                        'published': pub_date,
-                        'date_published': pub_date,  # Add both formats for compatibility
-                    })
-                
-                print(f"✅ Fetched {len(posts)} posts from Micro.blog API")
-                return posts
-            else:
-                print(f"⚠️  API returned status {response.status_code}")
-                print(f"Response: {response.text[:200]}")
-                return []
-                
+            with open(self.cursor_file, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️  Could not read resume cursor: {e}")
+            return None
+    
+    def append_page(self, page):
+        """Add a completed page to the index log"""
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            for post in page:
+                f.write(json.dumps(post) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def load_index(self, title_map, index_bytes):
+        """
+        Rebuild the title index from the log, up to the size the cursor recorded
+        Anything after it (a page logged just before an interruption) is cut off.
+        """
+        with open(self.index_file, 'r+b') as f:
+            f.truncate(index_bytes)
+            for line in f.read().decode('utf-8').splitlines():
+                self.add_to_index(title_map, json.loads(line))
+        return index_bytes
+    
+    def save_cursor(self, offset, scanned):
+        """Checkpoint after a full page so an interrupted scan can resume"""
+        data = {
+            'offset': offset,
+            'scanned': scanned,
+            'saved_at': datetime.now().isoformat(),
+            'index_bytes': self.index_file.stat().st_size if self.index_file.exists() else 0,
+        }
+        try:
+            temp_file = self.cursor_file.with_suffix('.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_file, self.cursor_file)
+        except Exception as e:
+            print(f"⚠️  Could not save resume cursor: {e}")
+    
+    def index_posts_from_api(self, resume=False, page_size=100):
+        """
+        Build the title index from every post via paged Micropub source queries
+        Posts are indexed as each page arrives and only URL and date are kept,
+        so memory stays small. Each page is appended to the index log and the
+        position checkpointed; with resume, an interrupted scan rebuilds the
+        index from the log and continues from its cursor.
+        """
+        title_map = defaultdict(list)
+        offset = 0
+        scanned = 0
+        
+        cursor = self.load_cursor() if resume else None
+        if cursor:
+            try:
+                self.load_index(title_map, cursor['index_bytes'])
+                offset = cursor['offset']
+                scanned = cursor['scanned']
+                print(f"↩️  Resuming at offset {offset} ({scanned} posts already scanned)")
+            except Exception as e:
+                print(f"⚠️  Could not read index log, starting over: {e}")
+                title_map.clear()
+                cursor = None
+        if not cursor:
+            # Fresh scan: start a new log
+            self.index_file.write_bytes(b'')
+        
+        page_offset = offset
+        page = []
+        try:
+            for post in iter_source_posts(self.session, self.api_url, self.token, page_size=page_size, offset=offset):
+                if post['offset'] != page_offset:
+                    # Previous page is complete: index it and checkpoint
+                    scanned = self.index_page(title_map, page, scanned)
+                    self.append_page(page)
+                    self.save_cursor(post['offset'], scanned)
+                    print(f"   📄 {scanned} posts scanned, {len(title_map)} titles")
+                    page_offset = post['offset']
+                    page = []
+                page.append({
+                    'url': post['url'],
+                    'title': post['title'],
+                    'published': post['published'],
+                    'date_published': post['published'],  # Add both formats for compatibility
+                })
+            scanned = self.index_page(title_map, page, scanned)
         except Exception as e:
+            # The partial page is dropped so a resumed scan does not index it twice
             print(f"❌ Error fetching from API: {e}")
-            return []
+            self.save_cursor(page_offset, scanned)
+            print(f"💾 Saved resume cursor at offset {page_offset}; rerun with --resume")
+            return None
+        
+        print(f"✅ Fetched {scanned} posts from Micro.blog API")
+        # Scan complete; the next run starts fresh
+        for path in (self.cursor_file, self.index_file):
+            if path.exists():
+                path.unlink()
+        return title_map
+    
+    def index_page(self, title_map, page, scanned):
+        """Add a fetched page to the title index; returns the new scanned count"""
+        for post in page:
+            self.add_to_index(title_map, post)
+        return scanned + len(page)
+    
+    def add_to_index(self, title_map, post):
+        """Add one post to the title index"""
+        title = post.get('title', '').strip().lower()
+        if title:
+            title_map[title].append({key: post[key] for key in ('url', 'published', 'date_published') if key in post})
     
     def find_duplicates_by_title(self, posts):
         """Find duplicate posts by title"""
         title_map = defaultdict(list)
         
         for post in posts:
-            title = post.get('title', '').strip().lower()
-            if title:
-                title_map[title].append(post)
+            self.add_to_index(title_map, post)
         
+        return self.duplicates_in_index(title_map)
+    
+    def duplicates_in_index(self, title_map):
+        """Titles with more than one post"""
         # Find titles with multiple posts
         duplicates = {}
         for title, post_list in title_map.items():
@@ -155,7 +221,7 @@ class DuplicateCleanup:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def run(self, dry_run=True, use_api=False):
+    def run(self, dry_run=True, use_api=False, resume=False, page_size=100):
         """Find and optionally delete duplicate posts"""
         print("🔍 Micro.blog Duplicate Cleanup")
         print("=" * 60)
@@ -169,23 +235,30 @@ class DuplicateCleanup:
         
         # Get posts
         if use_api:
-            print("📡 Fetching posts from Micropub API...")
-            posts = self.get_all_posts_from_api()
+            print(f"📡 Fetching posts from Micropub API ({page_size} per page)...")
+            title_map = self.index_posts_from_api(resume=resume, page_size=page_size)
+            if title_map is None:
+                return
+            total = sum(len(post_list) for post_list in title_map.values())
         else:
             print("📡 Fetching posts from JSON feed...")
             posts = self.get_all_posts_from_feed()
             print(f"⚠️  Note: Feed limited to ~20 recent posts. Use --api for full list.")
+            total = len(posts)
         
-        if not posts:
+        if not total:
             print("❌ No posts found!")
             return
         
-        print(f"📊 Total posts: {len(posts)}")
+        print(f"📊 Total posts: {total}")
         print()
         
         # Find duplicates
         print("🔍 Scanning for duplicates...")
-        duplicates = self.find_duplicates_by_title(posts)
+        if use_api:
+            duplicates = self.duplicates_in_index(title_map)
+        else:
+            duplicates = self.find_duplicates_by_title(posts)
         
         if not duplicates:
             print("✅ No duplicates found!")
@@ -276,6 +349,8 @@ def main():
     parser = argparse.ArgumentParser(description='Find and delete duplicate posts on Micro.blog')
     parser.add_argument('--delete', action='store_true', help='Actually delete duplicates (default is dry-run)')
     parser.add_argument('--api', action='store_true', help='Use Micropub API to fetch all posts (not just feed)')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted --api scan from its saved cursor')
+    parser.add_argument('--page-size', type=int, default=100, metavar='N', help='Posts per Micropub request with --api (default: 100)')
     parser.add_argument('--help-guide', action='store_true', help='Show detailed cleanup guide')
     
     args = parser.parse_args()
@@ -301,7 +376,8 @@ post titles and keeping only the oldest version of each post.
 ⚠️  IMPORTANT NOTES
 -------------------
 • Feed method: Only sees ~20 most recent posts
-• API method: Can fetch up to 1000 posts (recommended)
+• API method: Pages through every post (recommended); an interrupted scan
+  saves a cursor (cleanup_cursor.json) and continues with --resume
 • Keeps the OLDEST post (first published) as the canonical version
 • Dry-run is default - posts won't be deleted unless you use --delete
 
@@ -317,6 +393,9 @@ post titles and keeping only the oldest version of each post.
 3. Actually delete duplicates (USE WITH CAUTION):
    python3 cleanup_duplicates.py --api --delete
 
+   Resume an API scan that was interrupted:
+   python3 cleanup_duplicates.py --api --resume
+
 4. Check feed duplicates and delete:
    python3 cleanup_duplicates.py --delete
 
@@ -344,7 +423,7 @@ Once deleted via API, posts are gone permanently. Always start with dry-run!
         return
     
     cleanup = DuplicateCleanup()
-    cleanup.run(dry_run=not args.delete, use_api=args.api)
+    cleanup.run(dry_run=not args.delete, use_api=args.api, resume=args.resume, page_size=args.page_size)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Minimal stand-in WebSub hub for testing websub.py locally
+Accepts (un)subscribe requests, verifies intent with the subscriber's
+callback, and on a publish ping fetches the topic and pushes it to every
+verified subscriber, signed with X-Hub-Signature. No persistence, no retries.
+"""
+
+import hmac
+import time
+import hashlib
+import secrets
+import argparse
+import threading
+import requests
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LocalHub:
+    def __init__(self, max_lease=None):
+        """Initialize hub; max_lease caps the granted lease (short leases exercise renewal)"""
+        self.max_lease = max_lease
+        # Verified subscriptions keyed by (topic, callback)
+        self.subscriptions = {}
+        self.lock = threading.Lock()
+    
+    def verify(self, mode, topic, callback, secret, lease):
+        """Confirm intent with the subscriber (GET with a challenge), then record the change"""
+        challenge = secrets.token_hex(16)
+        params = {'hub.mode': mode, 'hub.topic': topic, 'hub.challenge': challenge}
+        if mode == 'subscribe':
+            params['hub.lease_seconds'] = str(lease)
+        try:
+            response = requests.get(callback, params=params, timeout=10)
+        except Exception as e:
+            print(f"   ✗ Error verifying {callback}: {e}")
+            return
+        if response.status_code != 200 or response.text != challenge:
+            print(f"   ✗ {callback} did not confirm {mode} for {topic}")
+            return
+        
+        with self.lock:
+            if mode == 'subscribe':
+                self.subscriptions[(topic, callback)] = {'secret': secret, 'expires': time.time() + lease}
+            else:
+                self.subscriptions.pop((topic, callback), None)
+        print(f"   ✓ Verified {mode} of {callback} to {topic} (lease {lease}s)" if mode == 'subscribe'
+              else f"   ✓ Verified {mode} of {callback} from {topic}")
+    
+    def publish(self, topic):
+        """Fetch a topic and push it to its subscribers; returns how many were sent"""
+        try:
+            response = requests.get(topic, timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"   ✗ Error fetching {topic}: {e}")
+            return 0
+        body = response.content
+        content_type = response.headers.get('Content-Type', 'application/atom+xml')
+        
+        with self.lock:
+            subscribers = [(callback, sub) for (sub_topic, callback), sub in self.subscriptions.items()
+                           if sub_topic == topic and sub['expires'] > time.time()]
+        sent = 0
+        for callback, sub in subscribers:
+            headers = {'Content-Type': content_type}
+            if sub['secret']:
+                signature = hmac.new(sub['secret'].encode(), body, hashlib.sha256).hexdigest()
+                headers['X-Hub-Signature'] = f"sha256={signature}"
+            try:
+                requests.post(callback, data=body, headers=headers, timeout=30)
+                sent += 1
+            except Exception as e:
+                print(f"   ✗ Error pushing to {callback}: {e}")
+        print(f"📨 Pushed {topic} to {sent} subscribers")
+        return sent
+    
+    def make_handler(self):
+        """Build the HTTP request handler bound to this hub"""
+        hub = self
+        
+        class HubHandler(BaseHTTPRequestHandler):
+            def reply(self, status, body=b''):
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+                params = {key: values[0] for key, values in parse_qs(body).items()}
+                mode = params.get('hub.mode')
+                
+                if mode in ('subscribe', 'unsubscribe'):
+                    topic = params.get('hub.topic')
+                    callback = params.get('hub.callback')
+                    if not topic or not callback:
+                        self.reply(400, b'hub.topic and hub.callback are required')
+                        return
+                    lease = int(params.get('hub.lease_seconds') or 86400)
+                    if hub.max_lease:
+                        lease = min(lease, hub.max_lease)
+                    # Intent is verified after the request is accepted, as a real hub does
+                    threading.Thread(
+                        target=hub.verify,
+                        args=(mode, topic, callback, params.get('hub.secret'), lease),
+                        daemon=True
+                    ).start()
+                    self.reply(202)
+                elif mode == 'publish':
+                    topic = params.get('hub.url') or params.get('hub.topic')
+                    if not topic:
+                        self.reply(400, b'hub.url is required')
+                        return
+                    hub.publish(topic)
+                    self.reply(204)
+                else:
+                    self.reply(400, b'unsupported hub.mode')
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return HubHandler
+    
+    def start(self, host='127.0.0.1', port=0):
+        """Serve in a background thread; returns the server (port 0 picks a free one)"""
+        server = ThreadingHTTPServer((host, port), self.make_handler())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stand-in WebSub hub for testing websub.py')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8081, help='Port to listen on')
+    parser.add_argument('--max-lease', type=int, help='Cap granted leases at this many seconds')
+    
+    args = parser.parse_args()
+    
+    server = LocalHub(max_lease=args.max_lease).start(args.host, args.port)
+    print(f"🧪 Local WebSub hub at http://{args.host}:{server.server_address[1]}/")
+    print("   Publish with: curl -d hub.mode=publish -d hub.url=<feed> <hub>")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
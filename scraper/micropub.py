@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Micropub helpers shared by the poster and cleanup scripts
+"""
+
+import re
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Publishing requests in flight at most, and attempts per post
+PUBLISH_WORKERS = 4
+MAX_ATTEMPTS = 4
+# Backoff without Retry-After: full jitter over BACKOFF_BASE * 2^attempt, capped
+BACKOFF_BASE = 2
+BACKOFF_CAP = 60
+# A longer Retry-After than this is left for the next run
+MAX_RETRY_AFTER = 300
+
+# Statuses that mean the server is overloaded or limiting us
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+# Statuses where the server did not act on the request, so even a create can be resent
+REJECTED_STATUSES = {429, 503}
+
+# Micro.blog serves the blog on both hosts; updates must use the custom domain
+BLOG_HOSTS = {
+    'adobedigest.micro.blog': 'adobedigest.com',
+}
+
+
+def canonical_url(url):
+    """Post URL on the custom domain"""
+    for host, domain in BLOG_HOSTS.items():
+        if host in url:
+            url = url.replace(host, domain)
+    return url
+
+
+def post_id_for(url, title=''):
+    """
+    Tracking ID of a published post, the same way the feed is matched:
+    APSB ID from the URL or title, else the URL slug (None for generated slugs)
+    """
+    match = re.search(r'apsb\d{2}-\d{2}', url, re.IGNORECASE)
+    if match:
+        return match.group(0).upper()
+    match = re.search(r'APSB\d{2}-\d{2}', title)
+    if match:
+        return match.group(0).upper()
+    # URL format: https://adobedigest.com/2025/10/22/sansec-sessionreaper-exploitation.html
+    slug_match = re.search(r'/([^/]+)\.html$', url)
+    if slug_match:
+        slug = slug_match.group(1)
+        # Ignore generic Micro.blog generated slugs like "000000", "13cd3c", etc.
+        if slug not in ['000000'] and not re.match(r'^[0-9a-f]{6}$', slug):
+            return slug
+    return None
+
+
+def same_post_id(found, post_id):
+    """Whether a post ID from post_id_for() is exactly this one (APSB IDs in any case)"""
+    return bool(found) and found.lower() == post_id.lower()
+
+
+def iter_source_posts(session, api_url, token, mp_destination=None, page_size=100, offset=0):
+    """
+    Every post on the blog via the Micropub source query, one page at a time
+    (Micro.blog lists newest first). Yields dicts with url, title, published,
+    content and the page offset they came from.
+    """
+    headers = {'Authorization': f'Bearer {token}'}
+    seen = set()
+    while True:
+        params = {'q': 'source', 'limit': page_size, 'offset': offset}
+        if mp_destination:
+            params['mp-destination'] = mp_destination
+        response = session.get(api_url, headers=headers, params=params, timeout=30)
+        response.raise_for_status()
+        items = response.json().get('items', [])
+        
+        new_items = 0
+        for item in items:
+            # All values are arrays in Micropub format
+            props = item.get('properties', {})
+            url = (props.get('url') or [''])[0]
+            title = (props.get('name') or [''])[0]
+            published = (props.get('published') or [''])[0]
+            content = (props.get('content') or [''])[0]
+            # Content is plain text or {'html': ..., 'value': ...}
+            if isinstance(content, dict):
+                content = content.get('html') or content.get('value') or ''
+            if url in seen:
+                continue
+            seen.add(url)
+            new_items += 1
+            yield {
+                'url': url,
+                'title': title,
+                'published': published,
+                'content': content,
+                'offset': offset,
+            }
+        
+        # A short page is the last one; a repeated page means offset is not honored
+        if len(items) < page_size or not new_items:
+            return
+        offset += len(items)
+
+
+def surely_unpublished(result):
+    """Whether a failed create certainly did not publish anything"""
+    status = result.get('status')
+    if status:
+        return status < 500 or status in REJECTED_STATUSES
+    return result.get('unsent', False)
+
+
+def is_retryable(result, idempotent):
+    """
+    Whether a failed publish can be sent again: updates replace properties, so
+    any transient failure is safe; a create only when it surely did not land
+    """
+    status = result.get('status')
+    if status:
+        return status in (THROTTLE_STATUSES if idempotent else REJECTED_STATUSES)
+    # No response at all: safe for updates, and for creates that never connected
+    return idempotent or result.get('unsent', False)
+
+
+def retry_delay(retry_after, attempt):
+    """Seconds to wait before the next attempt (None if Retry-After is too long to wait for)"""
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            delay = max(0.0, delay)
+            return delay if delay <= MAX_RETRY_AFTER else None
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on requests in flight: grows by one per window of successes,
+    halves when the server throttles, and pauses everyone for a Retry-After
+    """
+    
+    def __init__(self, max_limit=PUBLISH_WORKERS, initial=1):
+        self.max_limit = max_limit
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.condition = threading.Condition()
+    
+    def acquire(self):
+        """Wait for a free slot (and for any pause to end)"""
+        with self.condition:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    self.condition.wait(pause)
+                elif self.in_flight >= int(self.limit):
+                    self.condition.wait()
+                else:
+                    break
+            self.in_flight += 1
+    
+    def release(self, throttled=False, pause=0):
+        """Give the slot back, adjusting the limit by how the request went"""
+        with self.condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+                if pause:
+                    self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self.condition.notify_all()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Local mirror of every post published on Micro.blog
+Synced through the Micropub source query into SQLite
+(scraper/micropub_mirror.db), indexed by post ID, URL and title, so
+duplicate checks cover the whole history instead of the recent items in
+feed.json. After the first full sync the listing is read only until a run of
+already-mirrored posts (published dates are not trusted as a watermark:
+posts can be backdated or future-dated), with a full resync every
+FULL_SYNC_INTERVAL to catch backdated posts listed further down.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from micropub import canonical_url, post_id_for, iter_source_posts
+
+# Posts per source query page on an incremental sync (new posts are few)
+INCREMENTAL_PAGE_SIZE = 20
+# Already-mirrored posts in a row that end an incremental sync
+KNOWN_RUN = INCREMENTAL_PAGE_SIZE
+# How often the whole listing is read again
+FULL_SYNC_INTERVAL = timedelta(days=7)
+
+
+class MicropubMirror:
+    """SQLite table of published posts by URL"""
+    
+    def __init__(self, db_file=None):
+        """Initialize mirror (scraper/micropub_mirror.db by default)"""
+        self.db_file = Path(db_file) if db_file else Path(__file__).parent / 'micropub_mirror.db'
+        self.synced = False
+    
+    def connect(self):
+        """Open a connection, creating the tables on first use"""
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS posts (
+                url TEXT PRIMARY KEY,
+                post_id TEXT,
+                title TEXT,
+                title_key TEXT,
+                content_hash TEXT,
+                published TEXT,
+                synced_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS posts_post_id ON posts (post_id);
+            CREATE INDEX IF NOT EXISTS posts_title_key ON posts (title_key);
+            CREATE INDEX IF NOT EXISTS posts_published ON posts (published);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        return conn
+    
+    def last_full_sync(self):
+        """When the whole listing was last mirrored, or None"""
+        if not self.db_file.exists():
+            return None
+        conn = self.connect()
+        try:
+            row = conn.execute("SELECT value FROM sync_state WHERE key = 'last_full_sync'").fetchone()
+            return datetime.fromisoformat(row[0]) if row else None
+        finally:
+            conn.close()
+    
+    def sync(self, session, api_url, token, mp_destination=None):
+        """Fetch posts missing from the mirror (the whole listing when a full sync is due); returns how many were stored"""
+        last_full = self.last_full_sync()
+        full = not last_full or datetime.now() - last_full >= FULL_SYNC_INTERVAL
+        print(f"🪞 Syncing Micropub mirror ({'full' if full else 'incremental'})...")
+        known = set() if full else self.column('url')
+        page_size = 100 if full else INCREMENTAL_PAGE_SIZE
+        synced_at = datetime.now().isoformat(timespec='seconds')
+        rows = []
+        known_run = 0
+        try:
+            for post in iter_source_posts(session, api_url, token, mp_destination, page_size=page_size):
+                url = canonical_url(post['url'])
+                # Newest first: a long run of mirrored posts means the rest are mirrored already
+                if url in known:
+                    known_run += 1
+                    if known_run >= KNOWN_RUN:
+                        break
+                    continue
+                known_run = 0
+                title = post['title'].strip()
+                rows.append((
+                    url,
+                    post_id_for(url, title),
+                    title,
+                    title.lower(),
+                    hashlib.sha256(post['content'].encode('utf-8')).hexdigest(),
+                    post['published'],
+                    synced_at,
+                ))
+        except Exception as e:
+            # Store nothing: a partial page run would hide the gap from the next incremental sync
+            print(f"⚠️  Error syncing Micropub mirror: {e}")
+            return 0
+        
+        conn = self.connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO posts (url, post_id, title, title_key, content_hash, published, synced_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                if full:
+                    conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES ('last_full_sync', ?)", (synced_at,))
+        finally:
+            conn.close()
+        self.synced = True
+        print(f"🪞 Mirrored {len(rows)} {'posts' if full else 'new posts'} ({self.count()} total)")
+        return len(rows)
+    
+    def ids(self):
+        """Post IDs of every mirrored post"""
+        return self.column('post_id')
+    
+    def titles(self):
+        """Lowercased titles of every mirrored post"""
+        return self.column('title_key')
+    
+    def column(self, name):
+        """Distinct non-empty values of one column"""
+        if not self.db_file.exists():
+            return set()
+        conn = self.connect()
+        try:
+            return {row[0] for row in conn.execute(f"SELECT DISTINCT {name} FROM posts WHERE {name} IS NOT NULL AND {name} != ''")}
+        finally:
+            conn.close()
+    
+    def url_for(self, post_id):
+        """Published URL of a post ID (newest if several), or None"""
+        if not self.db_file.exists():
+            return None
+        conn = self.connect()
+        try:
+            row = conn.execute("SELECT url FROM posts WHERE post_id = ? ORDER BY published DESC LIMIT 1", (post_id,)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+    
+    def count(self):
+        """Number of mirrored posts"""
+        if not self.db_file.exists():
+            return 0
+        conn = self.connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        finally:
+            conn.close()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Durable publish outbox
+New posts are queued in outbox.json with everything needed to publish them,
+then claimed, published and marked done one at a time. Every step is saved
+before the next, so a run that dies mid-way resumes without double-posting.
+"""
+
+import os
+import json
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Default publish budget: posts per rolling hour (MICROBLOG_PUBLISH_BUDGET overrides)
+PUBLISH_BUDGET = 30
+BUDGET_WINDOW = timedelta(hours=1)
+# Runs that may try an entry before it is marked failed
+OUTBOX_ATTEMPTS = 5
+# Done entries are kept this long (for the budget and to spot late duplicates)
+KEEP_DONE = timedelta(days=7)
+
+
+class Outbox:
+    """Queue of posts to publish: pending -> claimed -> done (or failed)"""
+    
+    def __init__(self, outbox_file=None, budget=None):
+        """Initialize outbox (scraper/outbox.json by default)"""
+        self.outbox_file = Path(outbox_file) if outbox_file else Path(__file__).parent / 'outbox.json'
+        self.budget = budget if budget is not None else int(os.getenv('MICROBLOG_PUBLISH_BUDGET', PUBLISH_BUDGET))
+        # Publishing workers mark entries from several threads
+        self.lock = threading.Lock()
+        self.entries = self.load()
+    
+    def load(self):
+        """Entries by post ID"""
+        if not self.outbox_file.exists():
+            return {}
+        try:
+            with open(self.outbox_file, 'r') as f:
+                return {entry['id']: entry for entry in json.load(f).get('entries', [])}
+        except Exception as e:
+            print(f"⚠️  Error loading outbox: {e}")
+            return {}
+    
+    def save(self):
+        """Write the outbox atomically (call with the lock held)"""
+        cutoff = (datetime.now() - KEEP_DONE).isoformat()
+        entries = [entry for entry in self.entries.values()
+                   if entry['status'] != 'done' or entry.get('done_at', '') >= cutoff]
+        data = {
+            'last_updated': datetime.now().isoformat(),
+            'entries': sorted(entries, key=lambda entry: entry['enqueued_at']),
+        }
+        fd, temp_path = tempfile.mkstemp(dir=self.outbox_file.parent, prefix='.outbox.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.outbox_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def update(self, post_id, **fields):
+        """Change one entry and save"""
+        with self.lock:
+            self.entries[post_id].update(fields)
+            self.save()
+    
+    def enqueue(self, posts):
+        """Queue posts not seen before; returns how many were added"""
+        added = 0
+        with self.lock:
+            for post in posts:
+                if post['id'] in self.entries:
+                    continue
+                self.entries[post['id']] = {
+                    'id': post['id'],
+                    'status': 'pending',
+                    'enqueued_at': datetime.now().isoformat(),
+                    'attempts': 0,
+                    'post': {key: post[key] for key in ('title', 'content', 'date', 'categories')},
+                }
+                added += 1
+            if added:
+                self.save()
+        return added
+    
+    def in_status(self, status):
+        """Entries with a status, newest post first"""
+        entries = [entry for entry in self.entries.values() if entry['status'] == status]
+        return sorted(entries, key=lambda entry: entry['post']['date'], reverse=True)
+    
+    def done_ids(self):
+        """IDs already published through the outbox"""
+        return {post_id for post_id, entry in self.entries.items() if entry['status'] == 'done'}
+    
+    def budget_left(self):
+        """Posts that may still be published in the current budget window"""
+        since = (datetime.now() - BUDGET_WINDOW).isoformat()
+        used = sum(1 for entry in self.entries.values()
+                   if entry['status'] == 'done' and not entry.get('recovered') and entry.get('done_at', '') >= since)
+        return max(0, self.budget - used)
+    
+    def claim(self, limit):
+        """Mark up to limit pending entries claimed (saved before any is sent)"""
+        with self.lock:
+            claimed = self.in_status('pending')[:limit]
+            for entry in claimed:
+                entry['status'] = 'claimed'
+                entry['claimed_at'] = datetime.now().isoformat()
+                entry['attempts'] += 1
+            if claimed:
+                self.save()
+        return claimed
+    
+    def mark_done(self, post_id, url, recovered=False):
+        """Record a published post and where it lives"""
+        fields = {'status': 'done', 'url': url, 'done_at': datetime.now().isoformat()}
+        if recovered:
+            fields['recovered'] = True
+        self.update(post_id, **fields)
+    
+    def mark_pending(self, post_id, error=None):
+        """Put a claimed entry back in the queue (it was surely not published)"""
+        self.update(post_id, status='pending', error=error)
+    
+    def mark_failed(self, post_id, error):
+        """Give up on an entry until someone looks at it"""
+        self.update(post_id, status='failed', error=error)
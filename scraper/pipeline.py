@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Staged record pipeline
+Runs fetch → parse → render → write as overlapping stages joined by bounded
+queues, so the first post is written while later pages are still being
+fetched and a large backfill never holds more than a few queues' worth of
+records in memory. BeautifulSoup parsing holds the GIL, so the parse stage
+ships raw HTML to a process pool and gets plain dicts back. Scrapers provide
+the stages described in scrapers/records.py.
+"""
+
+import os
+import queue
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from scrapers.records import parse_in_process, write_record
+
+# Items held between two stages before the upstream stage waits
+QUEUE_SIZE = 16
+
+# Marks the end of the job list
+STOP = None
+
+
+class RecordPipeline:
+    def __init__(self, queue_size=QUEUE_SIZE, parse_workers=None, listeners=()):
+        """
+        Initialize pipeline with the size of each inter-stage queue
+        parse_workers: processes for HTML parsing (default: one per CPU, 0 parses in a thread)
+        listeners: objects whose record_written() hears about each written post
+        """
+        self.queue_size = queue_size
+        self.listeners = listeners
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self.pool = None
+        # Scrapers with a source still in flight; a scraper's next source waits
+        # for the previous one so dedup and tracking behave as in a serial run
+        self.busy = set()
+        self.busy_changed = threading.Condition()
+    
+    def claim(self, scraper):
+        """Wait until the scraper has no source in flight, then mark it busy"""
+        with self.busy_changed:
+            while id(scraper) in self.busy:
+                self.busy_changed.wait()
+            self.busy.add(id(scraper))
+    
+    def release(self, scraper):
+        """Let the scraper's next source start"""
+        with self.busy_changed:
+            self.busy.discard(id(scraper))
+            self.busy_changed.notify_all()
+    
+    def fetch_stage(self, jobs, outgoing):
+        """Stage 1: pull fetched items from each source in turn"""
+        for scraper, config in jobs:
+            self.claim(scraper)
+            try:
+                for item in scraper.iter_fetched(config):
+                    outgoing.put(('item', scraper, config, item))
+            except Exception as e:
+                print(f"✗ Error scraping {config.get('name', 'unknown')}: {e}")
+            outgoing.put(('end', scraper, config, None))
+        outgoing.put(STOP)
+    
+    def submit_parse(self, scraper, item):
+        """Send an item's HTML parse to the process pool when the scraper supports it"""
+        if self.pool and hasattr(scraper, 'parse_html'):
+            return self.pool.submit(parse_in_process, type(scraper), scraper.output_dir, item)
+        return None
+    
+    def emit_parsed(self, entry, outgoing):
+        """Pass one parsed item's records (or an end marker) downstream"""
+        kind, scraper, config, item, future = entry
+        if kind == 'end':
+            outgoing.put((kind, scraper, config, None))
+            return
+        try:
+            if future:
+                records = scraper.review_parsed(item, future.result())
+            else:
+                records = scraper.parse_fetched(item)
+            for record in records:
+                outgoing.put(('record', scraper, config, record))
+        except Exception as e:
+            print(f"✗ Error parsing {config.get('name', 'unknown')} item: {e}")
+    
+    def parse_stage(self, incoming, outgoing):
+        """Stage 2: turn fetched items into post records, in fetch order"""
+        pending = deque()
+        window = self.parse_workers * 2
+        while True:
+            # Hand on finished parses in order; wait on the oldest once the window is full
+            while pending and (pending[0][4] is None or pending[0][4].done() or len(pending) >= window):
+                self.emit_parsed(pending.popleft(), outgoing)
+            
+            try:
+                message = incoming.get(timeout=0.05 if pending else None)
+            except queue.Empty:
+                continue
+            if message is STOP:
+                while pending:
+                    self.emit_parsed(pending.popleft(), outgoing)
+                outgoing.put(STOP)
+                return
+            
+            kind, scraper, config, item = message
+            future = self.submit_parse(scraper, item) if kind == 'item' else None
+            pending.append((kind, scraper, config, item, future))
+    
+    def render_stage(self, incoming, outgoing):
+        """Stage 3: render records to markdown text"""
+        while True:
+            message = incoming.get()
+            if message is STOP:
+                outgoing.put(STOP)
+                return
+            kind, scraper, config, record = message
+            if kind == 'end':
+                outgoing.put(message)
+                continue
+            try:
+                rendered = scraper.render_markdown(record)
+            except Exception as e:
+                print(f"   ✗ Error creating markdown for {record.get('id', 'unknown')}: {e}")
+                continue
+            outgoing.put(('rendered', scraper, config, (record, rendered)))
+    
+    def run(self, jobs):
+        """
+        Run (scraper, source config) jobs through the pipeline
+        Writing happens on the calling thread. Returns (config, created_files)
+        per source, in job order.
+        """
+        fetched = queue.Queue(maxsize=self.queue_size)
+        parsed = queue.Queue(maxsize=self.queue_size)
+        rendered = queue.Queue(maxsize=self.queue_size)
+        
+        stages = [
+            threading.Thread(target=self.fetch_stage, args=(jobs, fetched), daemon=True),
+            threading.Thread(target=self.parse_stage, args=(fetched, parsed), daemon=True),
+            threading.Thread(target=self.render_stage, args=(parsed, rendered), daemon=True),
+        ]
+        # Spawned (not forked) workers, since the stage threads are already running
+        if self.parse_workers:
+            self.pool = ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=multiprocessing.get_context('spawn'))
+        
+        for stage in stages:
+            stage.start()
+        
+        # Stage 4: write files and run per-source bookkeeping
+        results = []
+        created_files = {}
+        while True:
+            message = rendered.get()
+            if message is STOP:
+                break
+            kind, scraper, config, payload = message
+            files = created_files.setdefault(id(config), [])
+            
+            if kind == 'end':
+                try:
+                    scraper.finish_source(config, files)
+                except Exception as e:
+                    print(f"✗ Error finishing {config.get('name', 'unknown')}: {e}")
+                results.append((config, files))
+                del created_files[id(config)]
+                self.release(scraper)
+                continue
+            
+            record, markdown = payload
+            filename = write_record(scraper, record, markdown, listeners=self.listeners)
+            if filename:
+                files.append(filename)
+        
+        for stage in stages:
+            stage.join()
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
+        return results
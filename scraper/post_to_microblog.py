@@ -7,16 +7,66 @@ import os
 import sys
 import requests
 import json
+import time
+import hashlib
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from scrapers.manifest import ContentManifest, REPO_ROOT
+from micropub import (canonical_url, post_id_for, same_post_id, iter_source_posts, is_retryable, surely_unpublished, retry_delay,
+                      AdaptiveConcurrency, PUBLISH_WORKERS, MAX_ATTEMPTS, THROTTLE_STATUSES)
+from outbox import Outbox, OUTBOX_ATTEMPTS
+from micropub_mirror import MicropubMirror
+
+# Posts updated per run when no limit is given
+UPDATE_LIMIT = 5
 
 # Load environment variables
 load_dotenv()
 
+
+def unquote(value):
+    """Front matter scalar without its quotes (undoing the escapes the scrapers write)"""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value[1:-1]
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1]
+    return value
+
+
+def post_hash(post):
+    """Hash of what a publish sends: title, content and categories"""
+    data = json.dumps([post['title'], post['content'], post.get('categories', [])], ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
 class MicroblogPoster:
-    def __init__(self):
+    def __init__(self, session=None, tracked_ids=None, feed_items=None, mirror=None, max_workers=PUBLISH_WORKERS):
+        """
+        Initialize poster from the environment
+        session, tracked_ids, feed_items, mirror: HTTP session, tracking file
+        IDs, feed.json items and Micropub mirror already loaded by the scraper,
+        so a combined run does not load them twice
+        max_workers: most Micropub requests in flight (the limit adapts below it)
+        """
+        self.session = session or requests.Session()
+        self.tracked_ids = tracked_ids
+        self.feed_items = feed_items
+        # Posts handed over by the scraper via record_written()
+        self.fresh_posts = []
+        # Post ID -> published URL, loaded from the tracking file on first use
+        self.published_urls = None
+        # Post ID -> post_hash() of what was last sent, loaded on first use
+        self.sent_hashes = None
+        self.concurrency = AdaptiveConcurrency(max_workers)
+        self.outbox = Outbox()
+        self.mirror = mirror or MicropubMirror()
         self.api_url = os.getenv('MICROBLOG_API_URL', 'https://micro.blog/micropub')
         self.token = os.getenv('MICROBLOG_TOKEN')
         self.mp_destination = os.getenv('MICROBLOG_MP_DESTINATION')
@@ -35,7 +85,10 @@ class MicroblogPoster:
         
         # First, load from tracking file (most comprehensive)
         tracking_file = Path(__file__).parent / 'scraped_posts.json'
-        if tracking_file.exists():
+        if self.tracked_ids is not None:
+            existing_ids.update(self.tracked_ids)
+            print(f"📊 Using {len(self.tracked_ids)} IDs from tracking file")
+        elif tracking_file.exists():
             try:
                 with open(tracking_file, 'r') as f:
                     tracking_data = json.load(f)
@@ -47,12 +100,7 @@ class MicroblogPoster:
         
         # Then, also check the feed for titles (for title-based deduplication)
         try:
-            response = requests.get(self.feed_url, timeout=10)
-            response.raise_for_status()
-            feed_data = response.json()
-            
-            for item in feed_data.get('items', []):
-                import re
+            for item in self.get_feed_items():
                 url = item.get('url', '')
                 title = item.get('title', '').strip()
                 
@@ -60,141 +108,153 @@ class MicroblogPoster:
                 if title:
                     existing_titles.add(title.lower())
                 
-                # Try to extract APSB ID from URL first
-                match = re.search(r'apsb\d{2}-\d{2}', url, re.IGNORECASE)
-                if match:
-                    existing_ids.add(match.group(0).upper())
-                else:
-                    # Try to extract from title
-                    match = re.search(r'APSB\d{2}-\d{2}', title)
-                    if match:
-                        existing_ids.add(match.group(0).upper())
-                    else:
-                        # Extract slug from URL for non-APSB posts (e.g., Sansec)
-                        # URL format: https://adobedigest.com/2025/10/22/sansec-sessionreaper-exploitation.html
-                        slug_match = re.search(r'/([^/]+)\.html$', url)
-                        if slug_match:
-                            slug = slug_match.group(1)
-                            # Ignore generic Micro.blog generated slugs like "000000", "13cd3c", etc.
-                            if slug not in ['000000'] and not re.match(r'^[0-9a-f]{6}$', slug):
-                                existing_ids.add(slug)
+                # APSB ID from URL or title, else the slug (e.g., Sansec)
+                post_id = post_id_for(url, title)
+                if post_id:
+                    existing_ids.add(post_id)
             
             print(f"📊 Found {len(existing_titles)} titles in feed")
         except Exception as e:
             print(f"⚠️  Could not load feed: {e}")
         
+        # Posts the outbox published but the tracking file may not have caught up on
+        existing_ids.update(self.outbox.done_ids())
+        
+        # Every post ever published, from the local Micropub mirror
+        if not self.mirror.synced:
+            self.mirror.sync(self.session, self.api_url, self.token, self.mp_destination)
+        mirror_ids = self.mirror.ids()
+        existing_ids.update(mirror_ids)
+        existing_titles.update(self.mirror.titles())
+        print(f"📊 Found {len(mirror_ids)} IDs in Micropub mirror")
+        
         print(f"📊 Total {len(existing_ids)} existing post IDs")
         # Store titles for later use
         self._existing_titles = existing_titles
         return existing_ids
     
-    def get_local_posts(self):
-        """Get all local markdown posts"""
+    def get_local_posts(self, paths=None):
+        """Get local markdown posts (all of them, or just the given files)"""
         posts = []
-        content_dir = Path(__file__).parent.parent / 'content'
+        if paths is None:
+            content_dir = Path(__file__).parent.parent / 'content'
+            # Look in year directories (2023, 2024, 2025, etc.)
+            paths = [md_file
+                     for year_dir in sorted(content_dir.glob('[0-9][0-9][0-9][0-9]'), reverse=True)
+                     for md_file in year_dir.rglob('*.md')]
         
-        # Look in year directories (2023, 2024, 2025, etc.)
-        for year_dir in sorted(content_dir.glob('[0-9][0-9][0-9][0-9]'), reverse=True):
-            for md_file in year_dir.rglob('*.md'):
-                try:
-                    with open(md_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                        # Parse front matter
-                        if content.startswith('---\n'):
-                            parts = content.split('---\n', 2)
-                            if len(parts) >= 3:
-                                front_matter = parts[1]
-                                body = parts[2].strip()
-                                
-                                # Extract fields from front matter
-                                import re
-                                title_match = re.search(r'^title:\s*["\']?(.+?)["\']?$', front_matter, re.MULTILINE)
-                                date_match = re.search(r'^date:\s*(.+)$', front_matter, re.MULTILINE)
-                                
-                                # Extract categories and tags (YAML list format)
-                                categories = []
-                                tags = []
-                                in_categories = False
-                                in_tags = False
-                                
-                                for line in front_matter.split('\n'):
-                                    if line.startswith('categories:'):
-                                        in_categories = True
-                                        in_tags = False
-                                        continue
-                                    elif line.startswith('tags:'):
-                                        in_tags = True
-                                        in_categories = False
-                                        continue
-                                    
-                                    if in_categories:
-                                        if line.startswith('  - '):
-                                            categories.append(line.strip('  - ').strip())
-                                        elif line and not line.startswith(' '):
-                                            in_categories = False
-                                    elif in_tags:
-                                        if line.startswith('  - '):
-                                            tags.append(line.strip('  - ').strip())
-                                        elif line and not line.startswith(' '):
-                                            in_tags = False
-                                
-                                # Extract post ID - either APSB ID or filename-based ID
-                                post_id = None
-                                if title_match:
-                                    title = title_match.group(1).strip()
-                                    # Try to extract APSB ID from title
-                                    id_match = re.search(r'APSB\d{2}-\d{2}', title)
-                                    if id_match:
-                                        post_id = id_match.group(0)
-                                
-                                # If no APSB ID, use filename as ID (for Sansec and other posts)
-                                if not post_id:
-                                    post_id = md_file.stem  # e.g., "sansec-sessionreaper-exploitation"
-                                
-                                if post_id and title_match and date_match:
-                                    # Use tags as categories for Micropub (Micro.blog uses categories as tags)
-                                    all_categories = tags if tags else categories
-                                    
-                                    posts.append({
-                                        'id': post_id,
-                                        'title': title if title_match else '',
-                                        'date': date_match.group(1).strip() if date_match else '',
-                                        'content': body,
-                                        'categories': all_categories,
-                                        'file': str(md_file)
-                                    })
-                except Exception as e:
-                    print(f"⚠️  Error reading {md_file}: {e}")
+        for md_file in paths:
+            try:
+                with open(md_file, 'r', encoding='utf-8') as f:
+                    post = self.parse_post(f.read(), md_file)
+                if post:
+                    posts.append(post)
+            except Exception as e:
+                print(f"⚠️  Error reading {md_file}: {e}")
         
         # Sort by date (newest first)
         posts.sort(key=lambda x: x['date'], reverse=True)
         return posts
     
+    def parse_post(self, content, md_file):
+        """Post dict from a markdown post's text (None if it lacks front matter, title or date)"""
+        import re
+        md_file = Path(md_file)
+        
+        # Parse front matter
+        if not content.startswith('---\n'):
+            return None
+        parts = content.split('---\n', 2)
+        if len(parts) < 3:
+            return None
+        front_matter = parts[1]
+        body = parts[2].strip()
+        
+        # Extract fields from front matter
+        title_match = re.search(r'^title:\s*(.+)$', front_matter, re.MULTILINE)
+        date_match = re.search(r'^date:\s*(.+)$', front_matter, re.MULTILINE)
+        
+        # Extract categories and tags (YAML list format)
+        categories = []
+        tags = []
+        in_categories = False
+        in_tags = False
+        
+        for line in front_matter.split('\n'):
+            if line.startswith('categories:'):
+                in_categories = True
+                in_tags = False
+                continue
+            elif line.startswith('tags:'):
+                in_tags = True
+                in_categories = False
+                continue
+            
+            if in_categories:
+                if line.startswith('  - '):
+                    categories.append(unquote(line[4:]))
+                elif line and not line.startswith(' '):
+                    in_categories = False
+            elif in_tags:
+                if line.startswith('  - '):
+                    tags.append(unquote(line[4:]))
+                elif line and not line.startswith(' '):
+                    in_tags = False
+        
+        # Extract post ID - either APSB ID or filename-based ID
+        post_id = None
+        if title_match:
+            title = unquote(title_match.group(1))
+            # Try to extract APSB ID from title
+            id_match = re.search(r'APSB\d{2}-\d{2}', title)
+            if id_match:
+                post_id = id_match.group(0)
+        
+        # If no APSB ID, use filename as ID (for Sansec and other posts)
+        if not post_id:
+            post_id = md_file.stem  # e.g., "sansec-sessionreaper-exploitation"
+        
+        if not (post_id and title_match and date_match):
+            return None
+        
+        # Use tags as categories for Micropub (Micro.blog uses categories as tags)
+        all_categories = tags if tags else categories
+        
+        return {
+            'id': post_id,
+            'title': title,
+            'date': unquote(date_match.group(1)),
+            'content': body,
+            'categories': all_categories,
+            'file': str(md_file)
+        }
+    
+    def record_written(self, kind, record, filename, status, text):
+        """Write listener: keep each post the scraper creates or modifies, for run(posts=...)"""
+        # Unchanged posts were handed over on an earlier run (unsent ones wait in the outbox)
+        if status not in ('created', 'modified'):
+            return
+        post = self.parse_post(text, filename)
+        if post:
+            self.fresh_posts.append(post)
+    
+    def get_feed_items(self):
+        """Items of the published feed, fetched once per poster"""
+        if self.feed_items is None:
+            response = self.session.get(self.feed_url, timeout=10)
+            response.raise_for_status()
+            self.feed_items = response.json().get('items', [])
+        return self.feed_items
+    
     def get_post_url_from_feed(self, post_id):
         """Get the URL of an existing post from the feed"""
         try:
-            response = requests.get(self.feed_url, timeout=10)
-            response.raise_for_status()
-            feed_data = response.json()
-            
-            for item in feed_data.get('items', []):
-                import re
+            for item in self.get_feed_items():
                 url = item.get('url', '')
-                
-                # Check if post_id is in the URL (works for both APSB IDs and slugs)
-                if re.search(re.escape(post_id.lower()), url.lower()):
+                # Exact APSB ID (URL or title) or URL slug, so 2-4-8 never matches 2-4-8-p1
+                if same_post_id(post_id_for(url, item.get('title', '')), post_id):
                     # Convert micro.blog subdomain to custom domain for API compatibility
-                    if 'adobedigest.micro.blog' in url:
-                        url = url.replace('adobedigest.micro.blog', 'adobedigest.com')
-                    return url
-                
-                # Also check title for APSB IDs
-                title = item.get('title', '')
-                if re.search(re.escape(post_id), title, re.IGNORECASE):
-                    if 'adobedigest.micro.blog' in url:
-                        url = url.replace('adobedigest.micro.blog', 'adobedigest.com')
-                    return url
+                    return canonical_url(url)
             return None
         except Exception as e:
             print(f"⚠️  Could not get post URL: {e}")
@@ -262,7 +322,7 @@ class MicroblogPoster:
             encoded_data = urlencode(data)
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 headers=headers,
                 data=encoded_data,
@@ -291,17 +351,120 @@ class MicroblogPoster:
                 return {
                     'success': False,
                     'status': response.status_code,
-                    'error': response.text
+                    'error': response.text,
+                    'retry_after': response.headers.get('Retry-After')
                 }
         
         except Exception as e:
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(e),
+                # The request never reached Micro.blog, so resending cannot duplicate it
+                'unsent': isinstance(e, requests.exceptions.ConnectTimeout)
             }
     
-    def save_to_tracking_file(self, post_ids):
-        """Save successfully posted IDs to tracking file"""
+    def publish(self, post, update_url=None):
+        """
+        Post or update one post, retrying transient failures with backoff
+        Creates are only resent when Micro.blog surely did not act on them.
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            self.concurrency.acquire()
+            if update_url:
+                result = self.post_to_microblog(
+                    title=post['title'],
+                    content=post['content'],
+                    update_url=update_url,
+                    categories=post.get('categories', [])
+                )
+            else:
+                result = self.post_to_microblog(
+                    title=post['title'],
+                    content=post['content'],
+                    published_date=post['date'],
+                    categories=post.get('categories', [])
+                )
+            result['attempts'] = attempt + 1
+            
+            throttled = not result['success'] and (result.get('status') in THROTTLE_STATUSES or not result.get('status'))
+            delay = retry_delay(result.get('retry_after'), attempt) if throttled else 0
+            # A Retry-After holds back every worker, not just this one
+            self.concurrency.release(throttled, pause=delay if result.get('retry_after') else 0)
+            
+            if result['success'] or attempt + 1 == MAX_ATTEMPTS or not is_retryable(result, bool(update_url)) or delay is None:
+                return result
+            
+            print(f"   ⏳ {post['id']}: {result.get('status') or result.get('error')}, retrying in {delay:.1f}s")
+            if not result.get('retry_after'):
+                time.sleep(delay)
+        return result
+    
+    def load_tracking_section(self, key):
+        """One map from the tracking file (empty if missing)"""
+        tracking_file = Path(__file__).parent / 'scraped_posts.json'
+        if tracking_file.exists():
+            try:
+                with open(tracking_file, 'r') as f:
+                    return json.load(f).get(key, {})
+            except Exception as e:
+                print(f"⚠️  Could not load {key}: {e}")
+        return {}
+    
+    def load_published_urls(self):
+        """Post ID -> published URL map from the tracking file"""
+        if self.published_urls is None:
+            self.published_urls = self.load_tracking_section('published_urls')
+        return self.published_urls
+    
+    def load_sent_hashes(self):
+        """Post ID -> hash of the last title, content and categories sent"""
+        if self.sent_hashes is None:
+            self.sent_hashes = self.load_tracking_section('sent_hashes')
+        return self.sent_hashes
+    
+    def get_post_url(self, post_id):
+        """
+        URL of an existing post: from the stored map or the Micropub mirror,
+        else a stored URL whose ID or slug is exactly the ID, else the feed
+        (remembered for next time)
+        """
+        published_urls = self.load_published_urls()
+        if post_id in published_urls:
+            return published_urls[post_id]
+        url = self.mirror.url_for(post_id)
+        if url:
+            return url
+        
+        for url in published_urls.values():
+            if same_post_id(post_id_for(url), post_id):
+                return url
+        
+        url = self.get_post_url_from_feed(post_id)
+        if url:
+            published_urls[post_id] = url
+        return url
+    
+    def sync_published_urls(self):
+        """Backfill the published URL map from every post on the blog (Micropub source query)"""
+        print("🔄 Syncing published URLs from Micro.blog...")
+        urls = {}
+        try:
+            for post in iter_source_posts(self.session, self.api_url, self.token, self.mp_destination):
+                post_id = post_id_for(post['url'], post['title'])
+                if post_id and post['url']:
+                    urls[post_id] = canonical_url(post['url'])
+        except Exception as e:
+            print(f"⚠️  Error syncing published URLs: {e}")
+            if not urls:
+                return 0
+        
+        self.load_published_urls().update(urls)
+        self.save_to_tracking_file([], urls)
+        print(f"🔗 Synced {len(urls)} published URLs")
+        return len(urls)
+    
+    def save_to_tracking_file(self, post_ids, urls=None, hashes=None):
+        """Save successfully posted IDs (with their published URLs and sent hashes) to tracking file"""
         tracking_file = Path(__file__).parent / 'scraped_posts.json'
         
         # Load existing data
@@ -318,12 +481,19 @@ class MicroblogPoster:
         original_count = len(current_ids)
         current_ids.update(post_ids)
         
-        # Save updated data
-        data = {
+        published_urls = data.get('published_urls', {})
+        published_urls.update(urls or {})
+        sent_hashes = data.get('sent_hashes', {})
+        sent_hashes.update(hashes or {})
+        
+        # Save updated data (keeping other sections such as release_tracking)
+        data.update({
             'ids': sorted(list(current_ids)),
             'last_updated': datetime.now().isoformat(),
-            'total_count': len(current_ids)
-        }
+            'total_count': len(current_ids),
+            'published_urls': dict(sorted(published_urls.items())),
+            'sent_hashes': dict(sorted(sent_hashes.items()))
+        })
         
         try:
             with open(tracking_file, 'w') as f:
@@ -333,36 +503,101 @@ class MicroblogPoster:
         except Exception as e:
             print(f"⚠️  Error saving tracking file: {e}")
     
-    def run(self, limit=5, update_mode=False):
-        """Post new bulletins to Micro.blog or update existing ones"""
+    def get_manifest_paths(self, manifest_file=None):
+        """Post files the last scraper run created or modified, per its content manifest (None if unreadable)"""
+        try:
+            manifest = ContentManifest.load(manifest_file)
+        except Exception as e:
+            print(f"⚠️  Could not read content manifest, scanning all posts: {e}")
+            return None
+        paths = [REPO_ROOT / entry['path'] for entry in manifest.changed()]
+        print(f"🧾 Content manifest lists {len(paths)} changed posts {manifest.summary()}")
+        return [path for path in paths if path.exists()]
+    
+    def recover_claimed(self):
+        """
+        Settle outbox entries a previous run claimed but never marked: done if
+        the post is on the blog, otherwise back in the queue
+        """
+        for entry in self.outbox.in_status('claimed'):
+            url = self.get_post_url(entry['id'])
+            if url or entry['post']['title'].lower() in self._existing_titles:
+                print(f"🔎 {entry['id']} was published by an interrupted run")
+                self.outbox.mark_done(entry['id'], url, recovered=True)
+            else:
+                self.outbox.mark_pending(entry['id'], error='interrupted before publishing')
+    
+    def publish_queued(self, post):
+        """Publish one claimed outbox entry and record the outcome straight away"""
+        result = self.publish(post)
+        if result['success']:
+            self.outbox.mark_done(post['id'], canonical_url(result.get('url', '')))
+        elif surely_unpublished(result):
+            error = f"{result.get('status', '')} {result.get('error', '')}".strip()
+            if post['attempts'] >= OUTBOX_ATTEMPTS:
+                self.outbox.mark_failed(post['id'], error)
+            else:
+                self.outbox.mark_pending(post['id'], error)
+        # Otherwise it may have landed; it stays claimed until the next run checks
+        return result
+    
+    def run(self, limit=None, update_mode=False, manifest=None, posts=None):
+        """
+        Post new bulletins to Micro.blog or update existing ones
+        With a manifest (True for the default file, or a path) only posts the
+        last scraper run created or modified are considered; with posts (from
+        parse_post()) only those are, and content/ is not read at all.
+        New posts go through the outbox and are published within its rate
+        budget (and at most limit); updates default to UPDATE_LIMIT.
+        """
         print("🚀 Micro.blog Poster")
         print("=" * 50)
         
         # Get existing and local posts
         existing_ids = self.get_existing_posts()
-        local_posts = self.get_local_posts()
+        if posts is not None:
+            local_posts = sorted(posts, key=lambda x: x['date'], reverse=True)
+        elif manifest:
+            local_posts = self.get_local_posts(self.get_manifest_paths(None if manifest is True else manifest))
+        else:
+            local_posts = self.get_local_posts()
         
         print(f"📊 Found {len(local_posts)} local posts")
         print(f"📊 Found {len(existing_ids)} existing posts in feed")
         
         if update_mode:
-            # Update mode: update existing posts
-            posts_to_process = [p for p in local_posts if p['id'] in existing_ids]
+            # Update mode: update existing posts whose title, content or categories changed since last sent
+            existing_posts = [p for p in local_posts if p['id'] in existing_ids]
+            sent_hashes = self.load_sent_hashes()
+            posts_to_process = [p for p in existing_posts if sent_hashes.get(p['id']) != post_hash(p)]
             mode_name = "update"
-            print(f"\n♻️  Update mode: Will update {len(posts_to_process)} existing posts")
+            print(f"\n♻️  Update mode: Will update {len(posts_to_process)} existing posts "
+                  f"({len(existing_posts) - len(posts_to_process)} unchanged since last sent)")
+            posts_to_process = posts_to_process[:limit or UPDATE_LIMIT]
         else:
-            # Create mode: only post new ones - check both ID and title
-            posts_to_process = []
+            # Create mode: only queue new ones - check both ID and title
+            new_posts = []
             for p in local_posts:
                 if p['id'] not in existing_ids:
                     # Also check if title already exists (for when slugs don't match)
                     if p['title'].lower() not in self._existing_titles:
-                        posts_to_process.append(p)
+                        new_posts.append(p)
                     else:
                         print(f"⏭️  Skipping duplicate by title: {p['title'][:60]}")
             
             mode_name = "publish"
-            print(f"\n📝 Found {len(posts_to_process)} new posts to publish")
+            added = self.outbox.enqueue(new_posts)
+            print(f"\n📥 Queued {added} new posts in the outbox")
+            self.recover_claimed()
+            
+            # Publish what the rate budget allows, newest posts first
+            budget = self.outbox.budget_left()
+            pending = len(self.outbox.in_status('pending'))
+            print(f"📝 {pending} posts waiting, budget allows {budget} this hour")
+            claimed = self.outbox.claim(min(budget, limit) if limit else budget)
+            posts_to_process = [dict(entry['post'], id=entry['id'], attempts=entry['attempts']) for entry in claimed]
+            if pending > len(posts_to_process):
+                print(f"⚠️  {pending - len(posts_to_process)} posts left in the outbox for the next run")
         
         if not posts_to_process:
             if update_mode:
@@ -371,65 +606,63 @@ class MicroblogPoster:
                 print("\n✅ No new posts to publish")
             return
         
-        # Limit posts to process
-        posts_to_process = posts_to_process[:limit]
-        
-        if len(posts_to_process) > limit:
-            print(f"⚠️  Limiting to {limit} posts per run")
-        
         # Process each post
         successful = 0
         failed = 0
         posted_ids = []
+        posted_urls = {}
+        posted_hashes = {}
         
+        # Get existing post URLs up front; the requests then go out concurrently
+        jobs = []
         for post in posts_to_process:
+            post_url = None
             if update_mode:
-                print(f"\n♻️  Updating {post['id']}...")
-                print(f"   Title: {post['title']}")
-                
-                # Get existing post URL
-                post_url = self.get_post_url_from_feed(post['id'])
+                post_url = self.get_post_url(post['id'])
                 if not post_url:
-                    print(f"   ⚠️  Could not find URL for {post['id']}, skipping")
+                    print(f"\n⚠️  Could not find URL for {post['id']}, skipping")
                     continue
-                
-                result = self.post_to_microblog(
-                    title=post['title'],
-                    content=post['content'],
-                    update_url=post_url,
-                    categories=post.get('categories', [])
-                )
+            jobs.append((post, post_url))
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency.max_limit) as pool:
+            if update_mode:
+                futures = [pool.submit(self.publish, post, post_url) for post, post_url in jobs]
             else:
-                print(f"\n📤 Publishing {post['id']}...")
+                futures = [pool.submit(self.publish_queued, post) for post, post_url in jobs]
+            # Report in submission order
+            for (post, post_url), future in zip(jobs, futures):
+                result = future.result()
+                if update_mode:
+                    print(f"\n♻️  Updating {post['id']}...")
+                else:
+                    print(f"\n📤 Publishing {post['id']}...")
                 print(f"   Title: {post['title']}")
+                if result.get('attempts', 1) > 1:
+                    print(f"   🔁 {result['attempts']} attempts")
                 
-                result = self.post_to_microblog(
-                    title=post['title'],
-                    content=post['content'],
-                    published_date=post['date'],
-                    categories=post.get('categories', [])
-                )
-            
-            if result['success']:
-                if result.get('updated'):
-                    print(f"   ✅ Updated successfully!")
+                if result['success']:
+                    if result.get('updated'):
+                        print(f"   ✅ Updated successfully!")
+                    else:
+                        print(f"   ✅ Published successfully!")
+                    if result.get('url'):
+                        print(f"   🔗 {result['url']}")
+                    successful += 1
+                    posted_ids.append(post['id'])  # Track successful posts
+                    if result.get('url'):
+                        posted_urls[post['id']] = canonical_url(result['url'])
+                    posted_hashes[post['id']] = post_hash(post)
                 else:
-                    print(f"   ✅ Published successfully!")
-                if result.get('url'):
-                    print(f"   🔗 {result['url']}")
-                successful += 1
-                posted_ids.append(post['id'])  # Track successful posts
-            else:
-                print(f"   ❌ Failed to {mode_name}")
-                error_msg = result.get('error', 'Unknown error')
-                status = result.get('status', 'unknown')
-                print(f"   Error: {error_msg}")
-                print(f"   Status: {status}")
-                failed += 1
-        
-        # Save successfully posted IDs to tracking file
+                    print(f"   ❌ Failed to {mode_name}")
+                    error_msg = result.get('error', 'Unknown error')
+                    status = result.get('status', 'unknown')
+                    print(f"   Error: {error_msg}")
+                    print(f"   Status: {status}")
+                    failed += 1
+        
+        # Save successfully posted IDs (and where they were published) to tracking file
         if posted_ids:
-            self.save_to_tracking_file(posted_ids)
+            self.save_to_tracking_file(posted_ids, posted_urls, posted_hashes)
         
         print("\n" + "=" * 50)
         if update_mode:
@@ -442,21 +675,34 @@ class MicroblogPoster:
 
 def main():
     # Parse command line args
-    limit = 5
+    limit = None
     update_mode = False
+    manifest = None
+    sync_urls = False
     
     for arg in sys.argv[1:]:
         if arg in ['--update', '-u']:
             update_mode = True
+        elif arg == '--manifest':
+            manifest = True
+        elif arg.startswith('--manifest='):
+            manifest = arg.split('=', 1)[1]
+        elif arg == '--sync-urls':
+            sync_urls = True
         elif arg in ['--help', '-h']:
-            print("Usage: post_to_microblog.py [LIMIT] [--update]")
+            print("Usage: post_to_microblog.py [LIMIT] [--update] [--manifest[=FILE]] | --sync-urls")
             print("\nArguments:")
-            print("  LIMIT      Maximum number of posts to process (default: 5)")
+            print("  LIMIT      Maximum number of posts to process (default: the publish budget,")
+            print("             MICROBLOG_PUBLISH_BUDGET posts per hour; 5 when updating)")
             print("  --update   Update existing posts instead of creating new ones")
+            print("  --manifest Only consider posts the last scraper run created or modified")
+            print("             (default file: scraper/content_manifest.json)")
+            print("  --sync-urls Store the URL of every published post for --update, then exit")
             print("\nExamples:")
             print("  python3 post_to_microblog.py 10          # Post up to 10 new bulletins")
             print("  python3 post_to_microblog.py --update    # Update up to 5 existing posts")
             print("  python3 post_to_microblog.py 10 --update # Update up to 10 existing posts")
+            print("  python3 post_to_microblog.py --manifest  # Post new bulletins from the last scrape")
             sys.exit(0)
         else:
             try:
@@ -467,7 +713,10 @@ def main():
                 sys.exit(1)
     
     poster = MicroblogPoster()
-    poster.run(limit=limit, update_mode=update_mode)
+    if sync_urls:
+        poster.sync_published_urls()
+        return
+    poster.run(limit=limit, update_mode=update_mode, manifest=manifest)
 
 
 if __name__ == '__main__':
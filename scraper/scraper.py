@@ -4,25 +4,55 @@ Adobe Digest Scraper Coordinator
 Coordinates multiple scrapers (Adobe HelpX, Sansec, etc.) to fetch security content
 """
 
+import os
 import re
+import sys
 import yaml
 import requests
+import contextlib
+import multiprocessing
 from pathlib import Path
-from scrapers import AdobeHelpxScraper, SansecScraper, AtomFeedScraper, AdobeReleasesScraper, NistNvdScraper
+from concurrent.futures import ProcessPoolExecutor
+from scrapers import AdobeHelpxScraper, SansecScraper, AtomFeedScraper, AdobeReleasesScraper, NistNvdScraper, FeedBundleScraper
+from scrapers.archive import PageArchive
+from scrapers.record_store import RecordStore
+from scrapers.manifest import ContentManifest
+from scrapers.events import EventStream
+from micropub_mirror import MicropubMirror
+from scrapers.markdown_writer import WRITE_LABELS, write_markdown
+from scrapers.records import reparse_in_process
+from pipeline import RecordPipeline
 
 
 class ScraperCoordinator:
-    def __init__(self, config_file='../data/sources.yaml', output_dir='../content', force=False):
-        """Initialize coordinator with config file and output directory"""
+    def __init__(self, config_file='../data/sources.yaml', output_dir='../content', force=False, parse_workers=None, offline=False,
+                 manifest_file=None, events=None):
+        """
+        Initialize coordinator with config file and output directory
+        offline: skip loading existing post IDs (for commands that only work on local data)
+        manifest_file: where run() writes the content manifest (scraper/content_manifest.json by default)
+        events: NDJSON file (or '-' for stdout) that run() streams new and updated records to
+        """
         self.config_file = Path(__file__).parent / config_file
         # Output to content directory
         self.output_dir = Path(__file__).parent / output_dir
         self.output_dir.mkdir(exist_ok=True)
         self.feed_url = 'https://adobedigest.com/feed.json'
+        # Shared with the poster in a combined scrape-and-post run
+        self.session = requests.Session()
+        self.tracked_ids = None
+        self.feed_items = None
+        self.mirror = MicropubMirror()
         self.force = force
+        self.parse_workers = parse_workers
+        self.manifest_file = manifest_file
+        # Opened now so '-' binds to the real stdout even if logging is redirected afterwards
+        self.events = EventStream(events) if events else None
         
         # Load existing posts to avoid duplicates (unless force mode)
-        if not force:
+        if offline:
+            self.existing_posts = set()
+        elif not force:
             self.existing_posts = self.load_existing_posts()
         else:
             self.existing_posts = set()
@@ -30,10 +60,11 @@ class ScraperCoordinator:
         
         # Initialize scrapers
         self.adobe_scraper = AdobeHelpxScraper(self.output_dir, self.existing_posts)
-        self.sansec_scraper = SansecScraper(self.output_dir, self.existing_posts)
-        self.atom_scraper = AtomFeedScraper(self.output_dir, self.existing_posts)
-        self.releases_scraper = AdobeReleasesScraper(self.output_dir, self.existing_posts)
+        self.sansec_scraper = SansecScraper(self.output_dir, self.existing_posts, force=force)
+        self.atom_scraper = AtomFeedScraper(self.output_dir, self.existing_posts, force=force)
+        self.releases_scraper = AdobeReleasesScraper(self.output_dir, self.existing_posts, force=force)
         self.nist_scraper = NistNvdScraper(self.output_dir, self.existing_posts)
+        self.bundle_scraper = FeedBundleScraper(self.output_dir, self.existing_posts, force=force)
     
     def load_from_tracking_file(self):
         """Load tracked IDs from scraped_posts.json"""
@@ -45,6 +76,7 @@ class ScraperCoordinator:
                     data = json.load(f)
                     ids = set(data.get('ids', []))
                     print(f"📄 Loaded {len(ids)} IDs from tracking file")
+                    self.tracked_ids = ids
                     return ids
             except Exception as e:
                 print(f"⚠️  Error loading tracking file: {e}")
@@ -53,12 +85,12 @@ class ScraperCoordinator:
     def load_from_feed(self):
         """Load IDs from published feed.json (limited to recent items)"""
         try:
-            response = requests.get(self.feed_url, timeout=10)
+            response = self.session.get(self.feed_url, timeout=10)
             response.raise_for_status()
-            feed_data = response.json()
+            self.feed_items = response.json().get('items', [])
             
             existing_ids = set()
-            for item in feed_data.get('items', []):
+            for item in self.feed_items:
                 # Extract APSB ID from URL or title (for Adobe bulletins)
                 url = item.get('url', '')
                 match = re.search(r'apsb\d{2}-\d{2}', url, re.IGNORECASE)
@@ -112,6 +144,16 @@ class ScraperCoordinator:
         print(f"📁 Loaded {len(existing_ids)} IDs from local files")
         return existing_ids
     
+    def load_from_mirror(self):
+        """Load IDs from the local Micropub mirror, syncing it first when a token is set"""
+        token = os.getenv('MICROBLOG_TOKEN')
+        if token:
+            api_url = os.getenv('MICROBLOG_API_URL', 'https://micro.blog/micropub')
+            self.mirror.sync(self.session, api_url, token, os.getenv('MICROBLOG_MP_DESTINATION'))
+        ids = self.mirror.ids()
+        print(f"🪞 Loaded {len(ids)} IDs from Micropub mirror")
+        return ids
+    
     def load_existing_posts(self):
         """Load existing posts from multiple sources (hybrid approach)"""
         print("🔍 Loading existing posts from multiple sources...")
@@ -130,6 +172,10 @@ class ScraperCoordinator:
         local_ids = self.load_from_local_files()
         existing_ids.update(local_ids)
         
+        # Source 4: Micropub mirror (full published history)
+        mirror_ids = self.load_from_mirror()
+        existing_ids.update(mirror_ids)
+        
         print(f"📊 Total unique IDs: {len(existing_ids)}")
         return existing_ids
     
@@ -151,14 +197,14 @@ class ScraperCoordinator:
         current_ids = set(data.get('ids', []))
         current_ids.update(new_ids)
         
-        # Save updated data
+        # Save updated data (keeping other sections such as release_tracking)
         import json
         from datetime import datetime
-        data = {
+        data.update({
             'ids': sorted(list(current_ids)),
             'last_updated': datetime.now().isoformat(),
             'total_count': len(current_ids)
-        }
+        })
         
         try:
             with open(tracking_file, 'w') as f:
@@ -173,65 +219,201 @@ class ScraperCoordinator:
             config = yaml.safe_load(f)
         return config.get('sources', [])
     
-    def run(self):
-        """Main coordinator execution"""
+    def get_scraper(self, source):
+        """Pick the scraper for a source config, or None for unknown types"""
+        source_type = source.get('type', 'unknown')
+        if source_type == 'adobe-helpx':
+            return self.adobe_scraper
+        elif source_type == 'adobe-release-notes':
+            return self.releases_scraper
+        elif source_type == 'atom-feed':
+            # Use generic atom scraper if source has 'includes' filter
+            if source.get('includes'):
+                return self.atom_scraper
+            # Use Sansec scraper for backward compatibility
+            return self.sansec_scraper
+        elif source_type == 'feed-bundle':
+            return self.bundle_scraper
+        elif source_type == 'nist-nvd':
+            return self.nist_scraper
+        return None
+    
+    # Archived page kinds that can be reparsed (record kinds of the scrapers that parse them)
+    REPARSE_KINDS = ('helpx', 'releases', 'nvd')
+    
+    def scraper_for_kind(self, kind):
+        """The scraper that renders records of a kind (feed bundles render like atom feeds)"""
+        for scraper in [self.adobe_scraper, self.releases_scraper, self.atom_scraper, self.sansec_scraper, self.nist_scraper]:
+            if scraper.RECORD_KIND == kind:
+                return scraper
+        return None
+    
+    def rewrite_posts(self, scraped_records, create_missing=False):
+        """
+        Re-render (scraper, records) pairs over existing posts
+        Posts that do not exist are left alone unless create_missing is set;
+        returns (written files, unchanged, not posted).
+        """
+        updated = []
+        unchanged = 0
+        not_posted = 0
+        for scraper, records in scraped_records:
+            for record in records:
+                try:
+                    filename, text = scraper.render_markdown(record)
+                except Exception as e:
+                    print(f"   ✗ Error creating markdown for {record.get('id', 'unknown')}: {e}")
+                    continue
+                
+                if not create_missing and not filename.exists():
+                    not_posted += 1
+                    continue
+                status = write_markdown(filename, text)
+                if status == 'unchanged':
+                    unchanged += 1
+                    continue
+                
+                updated.append(filename)
+                print(f"   {WRITE_LABELS[status]}: {filename}")
+        return updated, unchanged, not_posted
+    
+    def reparse(self, kinds=None):
+        """
+        Rebuild posts from the page archive with the current parsers
+        Only posts that already exist are rewritten; no network, no tracking changes.
+        """
+        print("🔁 Reparsing archived pages")
+        print("=" * 50)
+        
+        archive = PageArchive()
+        entries = archive.latest(set(kinds or self.REPARSE_KINDS))
+        print(f"📦 {len(entries)} archived pages to reparse")
+        
+        workers = (multiprocessing.cpu_count() or 1) if self.parse_workers is None else self.parse_workers
+        pool = ProcessPoolExecutor(max_workers=workers) if workers else None
+        
+        jobs = []
+        for entry in entries:
+            scraper = self.scraper_for_kind(entry['kind'])
+            args = (type(scraper), scraper.output_dir, archive.root, entry)
+            jobs.append((scraper, entry, pool.submit(reparse_in_process, *args) if pool else args))
+        
+        def reparsed():
+            for scraper, entry, job in jobs:
+                try:
+                    yield scraper, job.result() if pool else reparse_in_process(*job)
+                except Exception as e:
+                    print(f"   ✗ Error reparsing {entry['url']}: {e}")
+        
+        updated, unchanged, not_posted = self.rewrite_posts(reparsed())
+        if pool:
+            pool.shutdown()
+        
+        print("\n" + "=" * 50)
+        print(f"✅ Reparse complete! Updated {len(updated)} posts ({unchanged} unchanged, {not_posted} never posted)")
+        return updated
+    
+    def render(self, kinds=None):
+        """
+        Regenerate markdown for every stored record with the current templates
+        Missing posts are written too (CI starts with an empty content/); no network.
+        """
+        print("🖨️  Re-rendering stored records")
+        print("=" * 50)
+        
+        store = RecordStore()
+        count = store.count()
+        if not count:
+            # records.db is filled as posts are written; CI keeps it with actions/cache
+            print(f"⚠️  No records found in {store.db_file} - run the scraper first to store them")
+            return []
+        print(f"🗄️  {count} records in {store.db_file.name}")
+        
+        def stored():
+            for kind, record in store.iter_records(set(kinds) if kinds else None):
+                scraper = self.scraper_for_kind(kind)
+                if scraper:
+                    yield scraper, [record]
+                else:
+                    print(f"   ⚠️  No scraper renders {kind} records")
+        
+        written, unchanged, _ = self.rewrite_posts(stored(), create_missing=True)
+        
+        print("\n" + "=" * 50)
+        print(f"✅ Render complete! Wrote {len(written)} posts ({unchanged} unchanged)")
+        return written
+    
+    def extract_new_ids(self, source, files):
+        """IDs of the posts created for a source, derived from their filenames"""
+        source_type = source.get('type', 'unknown')
+        new_ids = set()
+        for file_path in files:
+            filename = Path(file_path).stem
+            if source_type == 'adobe-helpx':
+                match = re.search(r'apsb\d{2}-\d{2}', filename, re.IGNORECASE)
+                if match:
+                    new_ids.add(match.group(0).upper())
+            elif source_type == 'nist-nvd':
+                # Extract CVE ID from filename (format: nist-cve-YYYY-NNNNN)
+                match = re.search(r'cve-\d{4}-\d+', filename, re.IGNORECASE)
+                if match:
+                    new_ids.add(match.group(0).upper())
+            else:
+                new_ids.add(filename)
+        return new_ids
+    
+    def run(self, post_limit=None):
+        """
+        Main coordinator execution
+        post_limit: publish the run's posts to Micro.blog afterwards, handing
+        them to the poster in memory (0 for the publish budget alone, None
+        leaves publishing to post_to_microblog.py)
+        """
         print("🚀 Adobe Digest Security Scraper")
         print("=" * 50)
         
+        # Fail before scraping if posting is asked for but not configured
+        poster = None
+        if post_limit is not None:
+            from post_to_microblog import MicroblogPoster
+            poster = MicroblogPoster(session=self.session, tracked_ids=self.tracked_ids, feed_items=self.feed_items,
+                                     mirror=self.mirror)
+        
         # Load config
         sources = self.load_config()
         print(f"Loaded {len(sources)} sources from config\n")
         
+        jobs = []
+        for source in sources:
+            scraper = self.get_scraper(source)
+            if scraper:
+                jobs.append((scraper, source))
+            else:
+                print(f"⚠️  Unknown source type: {source.get('type', 'unknown')} for {source.get('name', 'unknown')}")
+        
+        # Fetch, parse, render and write overlap; posts land on disk as they are ready
+        manifest = ContentManifest(self.manifest_file)
+        listeners = [manifest] + ([self.events] if self.events else []) + ([poster] if poster else [])
+        pipeline = RecordPipeline(parse_workers=self.parse_workers, listeners=listeners)
         all_files = []
         new_ids = set()
+        for source, files in pipeline.run(jobs):
+            all_files.extend(files)
+            new_ids.update(self.extract_new_ids(source, files))
         
-        # Process each source
-        for source in sources:
-            source_type = source.get('type', 'unknown')
-            
-            try:
-                if source_type == 'adobe-helpx':
-                    files = self.adobe_scraper.scrape(source)
-                    all_files.extend(files)
-                    # Extract IDs from created files
-                    for file_path in files:
-                        filename = Path(file_path).stem
-                        match = re.search(r'apsb\d{2}-\d{2}', filename, re.IGNORECASE)
-                        if match:
-                            new_ids.add(match.group(0).upper())
-                elif source_type == 'adobe-release-notes':
-                    files = self.releases_scraper.scrape(source)
-                    all_files.extend(files)
-                    # Extract IDs from created files
-                    for file_path in files:
-                        filename = Path(file_path).stem
-                        new_ids.add(filename)
-                elif source_type == 'atom-feed':
-                    # Use generic atom scraper if source has 'includes' filter
-                    if source.get('includes'):
-                        files = self.atom_scraper.scrape(source)
-                    else:
-                        # Use Sansec scraper for backward compatibility
-                        files = self.sansec_scraper.scrape(source)
-                    all_files.extend(files)
-                    # Extract IDs from created files
-                    for file_path in files:
-                        filename = Path(file_path).stem
-                        new_ids.add(filename)
-                elif source_type == 'nist-nvd':
-                    files = self.nist_scraper.scrape(source)
-                    all_files.extend(files)
-                    # Extract CVE IDs from created files
-                    for file_path in files:
-                        filename = Path(file_path).stem
-                        # Extract CVE ID from filename (format: nist-cve-YYYY-NNNNN)
-                        match = re.search(r'cve-\d{4}-\d+', filename, re.IGNORECASE)
-                        if match:
-                            new_ids.add(match.group(0).upper())
-                else:
-                    print(f"⚠️  Unknown source type: {source_type} for {source.get('name', 'unknown')}")
-            except Exception as e:
-                print(f"✗ Error scraping {source.get('name', 'unknown')}: {e}")
+        # What changed this run, for the publish step and deploys
+        manifest.save()
+        
+        # Only the latest fetch of each page is reparsed; drop the rest
+        try:
+            dropped = PageArchive().compact()
+            if dropped:
+                print(f"🗜️  Compacted page archive ({dropped} superseded fetches dropped)")
+        except Exception as e:
+            print(f"⚠️  Error compacting page archive: {e}")
+        if self.events:
+            print(f"📡 Emitted {self.events.count} record events")
+            self.events.close()
         
         # DON'T update tracking file here - let post_to_microblog.py do it after publishing
         # This prevents marking posts as "already scraped" before they're actually published
@@ -239,14 +421,50 @@ class ScraperCoordinator:
         print("\n" + "=" * 50)
         print(f"✅ Complete! Created {len(all_files)} new posts")
         
+        if poster:
+            print()
+            poster.run(limit=post_limit or None, posts=poster.fresh_posts)
+        
         return all_files
 
 
 def main():
-    import sys
-    force = '--force' in sys.argv or '-f' in sys.argv
-    coordinator = ScraperCoordinator(force=force)
-    coordinator.run()
+    import argparse
+    parser = argparse.ArgumentParser(description='Scrape configured sources into Hugo content')
+    parser.add_argument('--force', '-f', action='store_true', help='Scrape all content, ignoring existing posts')
+    parser.add_argument('--parse-workers', type=int, metavar='N',
+                        help='Processes for HTML parsing (default: one per CPU, 0 parses in a thread)')
+    parser.add_argument('--manifest', metavar='PATH', help='Content manifest to write (default: scraper/content_manifest.json)')
+    parser.add_argument('--post', type=int, nargs='?', const=0, metavar='LIMIT',
+                        help='Publish the new posts to Micro.blog in the same run, within the publish budget (and at most LIMIT)')
+    parser.add_argument('--events', metavar='PATH',
+                        help="Stream new and updated records as NDJSON to a file, or '-' for stdout (logs then go to stderr)")
+    
+    commands = parser.add_subparsers(dest='command')
+    reparse = commands.add_parser('reparse', help='Rebuild existing posts from archived pages (no network)')
+    reparse.add_argument('--kind', action='append', choices=ScraperCoordinator.REPARSE_KINDS,
+                         help='Only reparse this kind of page (repeatable)')
+    reparse.add_argument('--parse-workers', type=int, metavar='N', default=argparse.SUPPRESS,
+                         help='Processes for parsing (default: one per CPU, 0 parses in this process)')
+    
+    render = commands.add_parser('render', help='Regenerate every post from stored records (no network)')
+    render.add_argument('--kind', action='append', choices=['helpx', 'releases', 'atom', 'sansec', 'nvd'],
+                        help='Only render this kind of record (repeatable)')
+    
+    args = parser.parse_args()
+    
+    coordinator = ScraperCoordinator(force=args.force, parse_workers=args.parse_workers, offline=args.command is not None,
+                                     manifest_file=args.manifest, events=args.events if args.command is None else None)
+    if args.command == 'reparse':
+        coordinator.reparse(kinds=args.kind)
+    elif args.command == 'render':
+        coordinator.render(kinds=args.kind)
+    elif args.events == '-':
+        # Keep stdout for events only
+        with contextlib.redirect_stdout(sys.stderr):
+            coordinator.run(post_limit=args.post)
+    else:
+        coordinator.run(post_limit=args.post)
 
 
 if __name__ == '__main__':
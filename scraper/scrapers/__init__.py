@@ -7,5 +7,6 @@ from .sansec_io import SansecScraper
 from .atom_feed import AtomFeedScraper
 from .adobe_releases import AdobeReleasesScraper
 from .nist_nvd import NistNvdScraper
+from .feed_bundle import FeedBundleScraper
 
-__all__ = ['AdobeHelpxScraper', 'SansecScraper', 'AtomFeedScraper', 'AdobeReleasesScraper', 'NistNvdScraper']
+__all__ = ['AdobeHelpxScraper', 'SansecScraper', 'AtomFeedScraper', 'AdobeReleasesScraper', 'NistNvdScraper', 'FeedBundleScraper']
@@ -10,28 +10,42 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urljoin
+from .archive import PageArchive
+from .record_store import RecordStore
+from .markdown_writer import WRITE_LABELS, render_post, write_markdown
+from .records import iter_records, scrape_records
 
 
 class AdobeHelpxScraper:
     """Scraper for Adobe security bulletins from helpx.adobe.com"""
     
+    # Kind under which written records are kept in the record store
+    RECORD_KIND = 'helpx'
+    
     def __init__(self, output_dir, existing_posts=None):
         """Initialize scraper"""
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.base_url = 'https://helpx.adobe.com'
         self.existing_posts = existing_posts or set()
+        self.archive = PageArchive()
+        self.record_store = RecordStore()
         
-    def fetch_page(self, url):
-        """Fetch and parse HTML page"""
+    def fetch_html(self, url):
+        """Fetch raw HTML for a page"""
         try:
             response = requests.get(url, timeout=30)
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            return response.text
         except Exception as e:
             print(f"   ✗ Error fetching {url}: {e}")
             return None
     
+    def fetch_page(self, url):
+        """Fetch and parse HTML page"""
+        html = self.fetch_html(url)
+        return BeautifulSoup(html, 'html.parser') if html is not None else None
+    
     def extract_bulletins_from_unified_page(self, soup, product_id):
         """
         Extract security bulletin links from the unified security bulletin page
@@ -234,8 +248,8 @@ class AdobeHelpxScraper:
         
         return data
     
-    def create_markdown(self, data):
-        """Create markdown file with Micro.blog front matter"""
+    def render_markdown(self, data):
+        """Build the post path and markdown with Micro.blog front matter"""
         # Generate filename
         date = data['published_date'] or datetime.now()
         
@@ -245,7 +259,6 @@ class AdobeHelpxScraper:
         
         # Create directory structure: YYYY/MM/DD/
         date_dir = self.output_dir / str(date.year) / f"{date.month:02d}" / f"{date.day:02d}"
-        date_dir.mkdir(parents=True, exist_ok=True)
         
         filename = date_dir / f"{slug}.md"
         
@@ -372,77 +385,89 @@ class AdobeHelpxScraper:
         
         content = '\n'.join(content_parts)
         
-        # Write file in Micro.blog format
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write('---\n')
-            for key, value in front_matter.items():
-                if isinstance(value, bool):
-                    f.write(f'{key}: {str(value).lower()}\n')
-                elif isinstance(value, list):
-                    f.write(f'{key}:\n')
-                    for item in value:
-                        f.write(f'  - {item}\n')
-                elif value is None or value == '':
-                    f.write(f'{key}: ""\n')
-                else:
-                    f.write(f'{key}: "{value}"\n')
-            f.write('---\n')
-            f.write(content)
-            f.write('\n')
-        
-        print(f"   ✓ Created: {filename}")
+        # Render in Micro.blog format
+        text = render_post(front_matter, content)
+        
+        return filename, text
+    
+    def create_markdown(self, data):
+        """Create markdown file with Micro.blog front matter"""
+        filename, text = self.render_markdown(data)
+        status = write_markdown(filename, text)
+        print(f"   {WRITE_LABELS[status]}: {filename}")
         return filename
     
-    def scrape(self, config):
-        """
-        Scrape bulletins for a product from Adobe HelpX
-        
-        Config format:
-        {
-            'name': 'adobe-commerce',
-            'url': 'https://helpx.adobe.com/security/security-bulletin.html',
-            'section_id': 'magento',  # The anchor ID on the page
-            'categories': []  # Optional categories to add
-        }
-        """
+    def iter_fetched(self, config):
+        """Fetch the bulletin index, then yield each new bulletin page as raw HTML"""
         product_name = config.get('name', 'unknown')
         section_id = config.get('section_id', product_name)
-        source_categories = config.get('categories', [])
         
         print(f"\n🔍 Scraping {product_name} from Adobe HelpX...")
         
         # Fetch the unified security bulletin page
         soup = self.fetch_page(config['url'])
         if not soup:
-            return []
+            return
         
         # Extract bulletin links from the product section
         bulletins = self.extract_bulletins_from_unified_page(soup, section_id)
         
-        created_files = []
-        
-        # Process each bulletin
         for bulletin in bulletins:
             print(f"   Processing {bulletin['id'].upper()}...")
             
             # Fetch bulletin page
-            bulletin_soup = self.fetch_page(bulletin['url'])
-            if not bulletin_soup:
+            html = self.fetch_html(bulletin['url'])
+            if html is None:
                 continue
             
-            # Parse bulletin
-            data = self.parse_bulletin(bulletin_soup, bulletin)
-            
-            # Add source info to data for markdown generation
-            data['source_name'] = product_name
-            data['source_categories'] = source_categories
-            
-            # Create markdown
-            try:
-                filename = self.create_markdown(data)
-                created_files.append(filename)
-                self.existing_posts.add(bulletin['id'])
-            except Exception as e:
-                print(f"   ✗ Error creating markdown for {bulletin['id']}: {e}")
-        
-        return created_files
+            item = {
+                'bulletin': bulletin,
+                'source_name': product_name,
+                'source_categories': config.get('categories', [])
+            }
+            self.archive.store(bulletin['url'], html, 'helpx', meta=item)
+            yield dict(item, html=html)
+    
+    def parse_html(self, item):
+        """Parse a fetched bulletin page into a plain dict (CPU-bound, safe in a worker process)"""
+        return self.parse_bulletin(BeautifulSoup(item['html'], 'html.parser'), item['bulletin'])
+    
+    def review_parsed(self, item, data):
+        """Add source info to a parsed bulletin for markdown generation"""
+        data['source_name'] = item['source_name']
+        data['source_categories'] = item['source_categories']
+        return [data]
+    
+    def parse_fetched(self, item):
+        """Parse a fetched bulletin page into a post record"""
+        return self.review_parsed(item, self.parse_html(item))
+    
+    def reparse_page(self, item):
+        """Post records from an archived bulletin page (item meta plus 'body')"""
+        return self.parse_fetched(dict(item, html=item['body']))
+    
+    def iter_records(self, config):
+        """Generator of bulletin post records"""
+        return iter_records(self, config)
+    
+    def mark_written(self, data, filename):
+        """Remember a written bulletin so later sources skip it"""
+        self.existing_posts.add(data['id'])
+    
+    def finish_source(self, config, created_files):
+        """Nothing to persist for HelpX sources"""
+        pass
+    
+    def scrape(self, config):
+        """
+        Scrape bulletins for a product from Adobe HelpX
+        
+        Config format:
+        {
+            'name': 'adobe-commerce',
+            'url': 'https://helpx.adobe.com/security/security-bulletin.html',
+            'section_id': 'magento',  # The anchor ID on the page
+            'categories': []  # Optional categories to add
+        }
+        """
+        return scrape_records(self, config)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Content-addressed archive of raw fetched pages
+Every fetched bulletin, release document, feed and NVD response is stored
+gzip-compressed under the SHA-256 of its body, so identical fetches share one
+object. index.jsonl records each fetch (URL, kind, time, hash and the context
+needed to parse it again) for offline reparsing. compact() drops superseded
+entries and the objects only they referenced. The archive is local-only:
+CI does not keep it between runs.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Feed bundles fetch from several threads; index appends must not interleave
+_index_lock = threading.Lock()
+
+
+class ArchiveWriter:
+    """Compress and hash a body as it is written; stored under its hash on close"""
+    
+    def __init__(self, archive, url, kind, meta=None):
+        self.archive = archive
+        self.url = url
+        self.kind = kind
+        self.meta = meta or {}
+        self.digest = hashlib.sha256()
+        self.size = 0
+        
+        archive.objects_dir.mkdir(parents=True, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=archive.objects_dir, suffix='.tmp')
+        self.file = gzip.GzipFile(fileobj=os.fdopen(fd, 'wb'), mode='wb')
+    
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.digest.update(data)
+        self.size += len(data)
+        self.file.write(data)
+    
+    def close(self, partial=False):
+        """Move the object into place (unless already stored) and index the fetch"""
+        fileobj = self.file.fileobj
+        self.file.close()
+        fileobj.close()
+        
+        sha256 = self.digest.hexdigest()
+        path = self.archive.object_path(sha256)
+        if path.exists():
+            os.remove(self.temp_path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self.temp_path, path)
+        
+        entry = {
+            'url': self.url,
+            'kind': self.kind,
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            'sha256': sha256,
+            'size': self.size,
+            'meta': self.meta,
+        }
+        if partial:
+            entry['partial'] = True
+        self.archive.append_index(entry)
+        return sha256
+
+
+class ArchiveTee:
+    """Binary stream wrapper that archives everything read through it"""
+    
+    def __init__(self, stream, writer):
+        self.stream = stream
+        self.writer = writer
+        self.finished = False
+    
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        if data:
+            self.writer.write(data)
+        else:
+            self.finished = True
+        return data
+    
+    def close(self):
+        """Archive what was read; a feed left early is indexed as partial"""
+        self.stream.close()
+        if self.writer:
+            self.writer.close(partial=not self.finished)
+            self.writer = None
+
+
+class PageArchive:
+    """Compressed, content-addressed store of raw fetched pages"""
+    
+    def __init__(self, root=None):
+        """Initialize archive (scraper/archive/ by default)"""
+        self.root = Path(root) if root else Path(__file__).parent.parent / 'archive'
+        self.objects_dir = self.root / 'objects'
+        self.index_file = self.root / 'index.jsonl'
+    
+    def object_path(self, sha256):
+        """Where a body with this hash lives"""
+        return self.objects_dir / sha256[:2] / f"{sha256}.gz"
+    
+    def append_index(self, entry):
+        """Record one fetch in the index"""
+        line = json.dumps(entry, sort_keys=True) + '\n'
+        with _index_lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+    
+    def store(self, url, body, kind, meta=None):
+        """Archive a complete fetched body; returns its hash (None on error)"""
+        try:
+            writer = ArchiveWriter(self, url, kind, meta)
+            writer.write(body)
+            return writer.close()
+        except Exception as e:
+            print(f"   ⚠️  Error archiving {url}: {e}")
+            return None
+    
+    def tee(self, stream, url, kind, meta=None):
+        """Wrap a stream being parsed so its body is archived as it is read"""
+        try:
+            return ArchiveTee(stream, ArchiveWriter(self, url, kind, meta))
+        except Exception as e:
+            print(f"   ⚠️  Error archiving {url}: {e}")
+            return stream
+    
+    def load(self, sha256):
+        """Raw body bytes for a hash"""
+        with gzip.open(self.object_path(sha256), 'rb') as f:
+            return f.read()
+    
+    def iter_index(self):
+        """Every indexed fetch, oldest first"""
+        if not self.index_file.exists():
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    
+    def compact(self):
+        """
+        Keep only the latest complete fetch per (kind, URL) and delete objects
+        nothing references any more; returns how many index entries were dropped
+        """
+        if not self.index_file.exists():
+            return 0
+        with _index_lock:
+            entries = list(self.iter_index())
+            kept = self.latest()
+            if len(kept) == len(entries):
+                return 0
+            
+            fd, temp_path = tempfile.mkstemp(dir=self.root, prefix='.index.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    for entry in sorted(kept, key=lambda entry: entry['fetched_at']):
+                        f.write(json.dumps(entry, sort_keys=True) + '\n')
+                os.replace(temp_path, self.index_file)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        
+        referenced = {entry['sha256'] for entry in kept}
+        for sha256 in {entry['sha256'] for entry in entries} - referenced:
+            path = self.object_path(sha256)
+            if path.exists():
+                path.unlink()
+        return len(entries) - len(kept)
+    
+    def latest(self, kinds=None):
+        """Most recent complete fetch per (kind, URL), optionally limited to some kinds"""
+        latest = {}
+        for entry in self.iter_index():
+            if entry.get('partial') or (kinds and entry['kind'] not in kinds):
+                continue
+            latest[(entry['kind'], entry['url'])] = entry
+        return list(latest.values())
@@ -5,45 +5,62 @@ Fetches articles from feeds with optional keyword filtering
 """
 
 import re
-import requests
 from datetime import datetime
 from pathlib import Path
-from xml.etree import ElementTree as ET
 from html import unescape
+from .feed_stream import FeedStream, load_feed_state, save_feed_state
+from .keywords import KeywordMatcher
+from .archive import PageArchive
+from .record_store import RecordStore
+from .enrichment import ArticleEnricher, article_excerpt, advisory_links
+from .markdown_writer import WRITE_LABELS, render_post, write_markdown
+from .records import iter_records, scrape_records, write_records
 
 
 class AtomFeedScraper:
     """Generic scraper for Atom/RSS feeds with filtering support"""
     
-    def __init__(self, output_dir, existing_posts=None):
+    # Kind under which written records are kept in the record store
+    RECORD_KIND = 'atom'
+    
+    def __init__(self, output_dir, existing_posts=None, force=False):
         """Initialize scraper"""
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.existing_posts = existing_posts or set()
+        self.force = force
+        # Per-feed timestamp and newest entry ID, keyed by feed URL
+        self.tracking_file = Path(__file__).parent.parent / 'scraped_posts.json'
+        self.feed_state = load_feed_state(self.tracking_file)
+        self.feed_state_changed = False
+        self.enricher = ArticleEnricher()
+        self.archive = PageArchive()
+        self.record_store = RecordStore()
         
-    def fetch_feed(self, url):
-        """Fetch and parse Atom/RSS feed"""
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            return ET.fromstring(response.content)
-        except Exception as e:
-            print(f"   ✗ Error fetching {url}: {e}")
-            return None
+    def fetch_feed(self, url, log=print):
+        """Fetch Atom/RSS feed as a stream of entry elements"""
+        return FeedStream(url, log=log, archive=self.archive)
     
     def matches_includes(self, text, includes):
-        """Check if text contains any of the include keywords (case-insensitive)"""
+        """Check if text contains any of the include keywords as whole words (case-insensitive)"""
         if not includes:
             return True  # No filter means include everything
         
-        text_lower = text.lower()
-        for keyword in includes:
-            if keyword.lower() in text_lower:
-                return True
-        return False
+        if not isinstance(includes, KeywordMatcher):
+            includes = KeywordMatcher(includes)
+        return includes.search(text)
     
-    def extract_articles(self, root, includes=None, source_prefix=''):
-        """Extract articles from Atom feed with optional keyword filtering"""
+    def extract_articles(self, entries, includes=None, source_prefix='', limit=None, stop_at_known=True, state=None, log=print):
+        """
+        Extract articles from a stream of feed entries with optional keyword filtering
+        Feeds are newest-first, so we stop once `limit` articles are collected or,
+        with stop_at_known, at the first entry we already have.
+        
+        `state` is this feed's stored {'updated', 'newest_id'}: an unchanged
+        feed-level timestamp skips the feed entirely, and reading stops at the
+        newest entry seen last time. It is updated in place for the next run.
+        Progress messages go through `log` so concurrent callers can buffer them.
+        """
         articles = []
         
         # Define namespaces
@@ -55,14 +72,25 @@ class AtomFeedScraper:
         total_found = 0
         skipped_duplicate = 0
         skipped_filter = 0
+        stopped_reason = None
+        newest_id = None
+        
+        # Previous feed timestamp and entry watermark (ignored in force mode)
+        previous = {} if state is None or self.force else dict(state)
         
-        # Find all entry elements (Atom) or item elements (RSS)
-        entries = root.findall('atom:entry', ns)
-        if not entries:
-            # Try RSS format
-            entries = root.findall('.//item')
+        # Compile the include keywords once for the whole feed
+        matcher = includes
+        if includes and not isinstance(includes, KeywordMatcher):
+            matcher = KeywordMatcher(includes)
         
+        # Entry elements (Atom) or item elements (RSS), parsed incrementally
         for entry in entries:
+            # Feed-level timestamp precedes the entries; if it hasn't moved, nothing has
+            feed_updated = getattr(entries, 'updated', None)
+            if total_found == 0 and feed_updated and feed_updated == previous.get('updated'):
+                stopped_reason = 'unchanged'
+                break
+            
             total_found += 1
             
             # Extract data
@@ -79,6 +107,28 @@ class AtomFeedScraper:
             if not article['url']:
                 continue
             
+            # Create ID from URL
+            url_slug = article['url'].split('/')[-1].replace('.html', '')
+            # Clean up URL parameters
+            url_slug = url_slug.split('?')[0].split('#')[0]
+            # Add source prefix to avoid collisions
+            article['id'] = f"{source_prefix}-{url_slug}" if source_prefix else url_slug
+            
+            # Everything from the previous run's newest entry on has been processed
+            if newest_id is None:
+                newest_id = article['id']
+            if article['id'] == previous.get('newest_id'):
+                stopped_reason = 'watermark'
+                break
+            
+            # Check for duplicates - everything after a known entry is older
+            if article['id'] in self.existing_posts:
+                skipped_duplicate += 1
+                if stop_at_known:
+                    stopped_reason = 'known'
+                    break
+                continue
+            
             # Get title
             title = entry.find('atom:title', ns)
             if title is None:
@@ -96,24 +146,12 @@ class AtomFeedScraper:
             article['summary'] = content_text
             
             # Apply includes filter
-            if includes:
+            if matcher:
                 combined_text = f"{article['title']} {content_text}"
-                if not self.matches_includes(combined_text, includes):
+                if not self.matches_includes(combined_text, matcher):
                     skipped_filter += 1
                     continue
             
-            # Create ID from URL
-            url_slug = article['url'].split('/')[-1].replace('.html', '')
-            # Clean up URL parameters
-            url_slug = url_slug.split('?')[0].split('#')[0]
-            # Add source prefix to avoid collisions
-            article['id'] = f"{source_prefix}-{url_slug}" if source_prefix else url_slug
-            
-            # Check for duplicates
-            if article['id'] in self.existing_posts:
-                skipped_duplicate += 1
-                continue
-            
             # Get published date
             date_elem = entry.find('atom:updated', ns) or entry.find('atom:published', ns)
             if date_elem is None:
@@ -130,27 +168,50 @@ class AtomFeedScraper:
                         from email.utils import parsedate_to_datetime
                         article['published_date'] = parsedate_to_datetime(date_str)
                 except Exception as e:
-                    print(f"   ⚠️  Error parsing date '{date_str}': {e}, using current time")
+                    log(f"   ⚠️  Error parsing date '{date_str}': {e}, using current time")
                     article['published_date'] = datetime.now()
             else:
-                print(f"   ⚠️  No date element found for {article.get('title', 'unknown')}, using current time")
+                log(f"   ⚠️  No date element found for {article.get('title', 'unknown')}, using current time")
                 article['published_date'] = datetime.now()
             
             articles.append(article)
+            
+            if limit and len(articles) >= limit:
+                stopped_reason = 'limit'
+                break
+        
+        # Stop reading the feed (closes the HTTP stream when we broke out early)
+        if hasattr(entries, 'close'):
+            entries.close()
+        
+        # Remember where this feed was for the next run
+        if state is not None and stopped_reason != 'unchanged':
+            if getattr(entries, 'updated', None):
+                state['updated'] = entries.updated
+            if newest_id:
+                state['newest_id'] = newest_id
         
-        if total_found > 0:
+        if stopped_reason == 'unchanged':
+            log(f"   ℹ️  Feed unchanged since {previous['updated']}, skipped")
+        elif total_found > 0:
+            if stopped_reason == 'watermark':
+                log(f"   ℹ️  Reached last run's newest entry after {total_found} entries, stopped reading feed")
+            elif stopped_reason == 'known':
+                log(f"   ℹ️  Reached a known entry after {total_found} entries, stopped reading feed")
+            elif stopped_reason == 'limit':
+                log(f"   ⚠️  Limited to {limit} most recent articles")
             if skipped_duplicate > 0:
-                print(f"   ℹ️  Skipped {skipped_duplicate} existing articles")
+                log(f"   ℹ️  Skipped {skipped_duplicate} existing articles")
             if skipped_filter > 0:
-                print(f"   ℹ️  Filtered out {skipped_filter} articles (not matching includes)")
-            print(f"   📥 Found {len(articles)} new articles to scrape")
+                log(f"   ℹ️  Filtered out {skipped_filter} articles (not matching includes)")
+            log(f"   📥 Found {len(articles)} new articles to scrape")
         else:
-            print(f"   ℹ️  No articles found")
+            log(f"   ℹ️  No articles found")
         
         return articles
     
-    def create_markdown(self, data):
-        """Create markdown file with Micro.blog front matter"""
+    def render_markdown(self, data):
+        """Build the post path and markdown with Micro.blog front matter"""
         date = data['published_date']
         
         # Use the full ID (already includes prefix)
@@ -158,7 +219,6 @@ class AtomFeedScraper:
         
         # Create directory structure: YYYY/MM/DD/
         date_dir = self.output_dir / str(date.year) / f"{date.month:02d}" / f"{date.day:02d}"
-        date_dir.mkdir(parents=True, exist_ok=True)
         
         filename = date_dir / f"{slug}.md"
         
@@ -187,8 +247,11 @@ class AtomFeedScraper:
         # Build content
         content_parts = []
         
-        # Add summary
-        if data['summary']:
+        # Add the enriched article text, or the feed summary
+        if data.get('article_text'):
+            content_parts.append(article_excerpt(data['article_text']))
+            content_parts.append('')
+        elif data['summary']:
             # Truncate summary if too long
             summary = data['summary']
             if len(summary) > 500:
@@ -196,6 +259,10 @@ class AtomFeedScraper:
             content_parts.append(summary)
             content_parts.append('')
         
+        if data.get('advisory_ids'):
+            content_parts.append(f"**Mentioned advisories:** {advisory_links(data['advisory_ids'])}")
+            content_parts.append('')
+        
         # Link to full article
         source_display = data.get('source_display_name', 'Source')
         content_parts.append(f"---\n")
@@ -203,40 +270,35 @@ class AtomFeedScraper:
         
         content = '\n'.join(content_parts)
         
-        # Write file in Micro.blog format
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write('---\n')
-            for key, value in front_matter.items():
-                if isinstance(value, bool):
-                    f.write(f'{key}: {str(value).lower()}\n')
-                elif isinstance(value, list):
-                    f.write(f'{key}:\n')
-                    for item in value:
-                        f.write(f'  - {item}\n')
-                elif value is None or value == '':
-                    f.write(f'{key}: ""\n')
-                else:
-                    f.write(f'{key}: "{value}"\n')
-            f.write('---\n')
-            f.write(content)
-            f.write('\n')
-        
-        print(f"   ✓ Created: {filename}")
+        # Render in Micro.blog format
+        text = render_post(front_matter, content)
+        
+        return filename, text
+    
+    def create_markdown(self, data):
+        """Create markdown file with Micro.blog front matter"""
+        filename, text = self.render_markdown(data)
+        status = write_markdown(filename, text)
+        print(f"   {WRITE_LABELS[status]}: {filename}")
         return filename
     
-    def scrape(self, config):
-        """
-        Scrape articles from Atom/RSS feed
+    def iter_fetched(self, config):
+        """Stream the source's feed and yield new articles with source info"""
+        source_name = config.get('name', 'feed')
+        includes = config.get('includes')
         
-        Config format:
-        {
-            'name': 'source-name',
-            'url': 'https://example.com/feed.xml',
-            'limit': 50,  # Optional: limit number of articles
-            'categories': [],  # Optional categories to add
-            'includes': ['keyword1', 'keyword2'],  # Optional: only include if title/content contains these
-            'display_name': 'Source Name'  # Optional: display name for attribution
-        }
+        filter_msg = f" (filtering for: {', '.join(includes)})" if includes else ""
+        print(f"\n🔍 Scraping {source_name}{filter_msg}...")
+        
+        state = dict(self.feed_state.get(config['url'], {}))
+        for article in self.iter_feed_records(config['url'], config, state=state):
+            yield article
+    
+    def iter_feed_records(self, source, config, state=None):
+        """
+        Yield post records from a feed for one source config
+        `source` is the feed URL or raw feed bytes (e.g. a WebSub push);
+        `state` is the feed's stored state when polling, None for pushes.
         """
         source_name = config.get('name', 'feed')
         limit = config.get('limit', 50)
@@ -244,25 +306,27 @@ class AtomFeedScraper:
         includes = config.get('includes')
         display_name = config.get('display_name', source_name.replace('-', ' ').title())
         
-        filter_msg = f" (filtering for: {', '.join(includes)})" if includes else ""
-        print(f"\n🔍 Scraping {source_name}{filter_msg}...")
-        
-        # Fetch the feed
-        root = self.fetch_feed(config['url'])
-        if root is None:
-            return []
-        
-        # Extract articles with filtering
-        articles = self.extract_articles(root, includes=includes, source_prefix=source_name)
+        # Stream the feed and extract articles with filtering, stopping early when possible
+        entries = self.fetch_feed(source)
+        articles = self.extract_articles(
+            entries,
+            includes=includes,
+            source_prefix=source_name,
+            limit=limit,
+            stop_at_known=config.get('stop_at_known', True),
+            state=state
+        )
         
-        # Apply limit
-        if limit and len(articles) > limit:
-            articles = articles[:limit]
-            print(f"   ⚠️  Limited to {limit} most recent articles")
+        # Optionally fetch the linked articles for full text and advisory IDs
+        if config.get('enrich') and articles:
+            self.enricher.enrich(articles, config['enrich'])
         
-        created_files = []
+        # New articles are only tracked once posted, so the watermark moves on
+        # the first run that finds nothing new (they are known by then)
+        if state is not None and not articles and state != self.feed_state.get(config['url'], {}):
+            self.feed_state[config['url']] = state
+            self.feed_state_changed = True
         
-        # Process each article
         for article in articles:
             print(f"   Processing {article['title'][:60]}...")
             
@@ -270,13 +334,44 @@ class AtomFeedScraper:
             article['source_name'] = source_name
             article['source_categories'] = source_categories
             article['source_display_name'] = display_name
-            
-            # Create markdown
-            try:
-                filename = self.create_markdown(article)
-                created_files.append(filename)
-                self.existing_posts.add(article['id'])
-            except Exception as e:
-                print(f"   ✗ Error creating markdown for {article['id']}: {e}")
-        
-        return created_files
+            yield article
+    
+    def parse_fetched(self, item):
+        """Feed entries are parsed while streaming"""
+        return [item]
+    
+    def iter_records(self, config):
+        """Generator of article post records"""
+        return iter_records(self, config)
+    
+    def mark_written(self, article, filename):
+        """Remember a written article so later sources skip it"""
+        self.existing_posts.add(article['id'])
+    
+    def finish_source(self, config, created_files):
+        """Save feed state once the source's posts are written"""
+        if self.feed_state_changed:
+            save_feed_state(self.tracking_file, self.feed_state)
+            self.feed_state_changed = False
+    
+    def process_feed(self, source, config, state=None):
+        """Turn a feed URL or raw feed bytes into posts; returns the created files"""
+        return write_records(self, self.iter_feed_records(source, config, state=state))
+    
+    def scrape(self, config):
+        """
+        Scrape articles from Atom/RSS feed
+        
+        Config format:
+        {
+            'name': 'source-name',
+            'url': 'https://example.com/feed.xml',
+            'limit': 50,  # Optional: limit number of articles
+            'categories': [],  # Optional categories to add
+            'includes': ['keyword1', 'keyword2'],  # Optional: only include if title/content contains these
+            'display_name': 'Source Name',  # Optional: display name for attribution
+            'enrich': True,  # Optional: fetch linked articles (or a dict of ArticleEnricher.DEFAULTS overrides)
+            'stop_at_known': True  # Optional: stop reading at the first already-scraped entry
+        }
+        """
+        return scrape_records(self, config)
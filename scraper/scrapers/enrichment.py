@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Full-article enrichment for feed entries
+Fetches linked article pages concurrently under a fetch/time budget and
+caches the extracted text and advisory IDs by URL
+"""
+
+import re
+import json
+import time
+import requests
+from datetime import datetime, timedelta
+from pathlib import Path
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Advisory identifiers worth surfacing in posts
+ADVISORY_PATTERN = re.compile(r'\b(CVE-\d{4}-\d{4,}|APSB\d{2}-\d{2,})\b', re.IGNORECASE)
+
+
+class ArticleEnricher:
+    """Fetch and cache the main text of linked articles"""
+    
+    DEFAULTS = {
+        'max_fetches': 20,    # Uncached pages fetched per run
+        'max_workers': 6,     # Pages fetched in parallel
+        'deadline': 60,       # Seconds the whole enrichment step may take
+        'timeout': 15,        # Seconds per page
+        'max_chars': 4000,    # Main text kept per article
+    }
+    
+    # Tags that never hold article text
+    NOISE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'svg']
+    
+    # Entries older than this are dropped from the cache when it is saved
+    CACHE_DAYS = 180
+    
+    def __init__(self, cache_file=None):
+        """Initialize enricher with a URL cache (scraper/article_cache.json by default)"""
+        self.cache_file = Path(cache_file) if cache_file else Path(__file__).parent.parent / 'article_cache.json'
+        self.cache = self.load_cache()
+        self.updated_urls = set()
+    
+    def load_cache(self):
+        """Load cached article extractions"""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"   ⚠️  Error loading article cache: {e}")
+        return {}
+    
+    def save_cache(self):
+        """Merge our new entries into the cache file and drop stale ones"""
+        if not self.updated_urls:
+            return
+        
+        # Another scraper may have saved since we loaded, so merge rather than overwrite
+        data = self.load_cache()
+        for url in self.updated_urls:
+            data[url] = self.cache[url]
+        
+        cutoff = (datetime.now() - timedelta(days=self.CACHE_DAYS)).isoformat()
+        data = {url: entry for url, entry in data.items() if entry.get('fetched_at', '') >= cutoff}
+        
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            self.updated_urls = set()
+        except Exception as e:
+            print(f"   ⚠️  Error saving article cache: {e}")
+    
+    def extract_main_text(self, html, max_chars):
+        """Pull readable paragraphs from the article body, skipping page chrome"""
+        soup = BeautifulSoup(html, 'html.parser')
+        for tag in soup(self.NOISE_TAGS):
+            tag.decompose()
+        
+        # Prefer explicit article containers, otherwise the element holding the most paragraph text
+        container = soup.find('article') or soup.find('main') or soup.find(attrs={'role': 'main'})
+        if container is None:
+            best_length = 0
+            for candidate in soup.find_all(['div', 'section']):
+                length = sum(len(p.get_text(strip=True)) for p in candidate.find_all('p', recursive=False))
+                if length > best_length:
+                    container, best_length = candidate, length
+        if container is None:
+            container = soup.body or soup
+        
+        paragraphs = []
+        total = 0
+        for elem in container.find_all(['p', 'li', 'h2', 'h3']):
+            text = ' '.join(elem.get_text(' ', strip=True).split())
+            if len(text) < 40 and elem.name in ('p', 'li'):
+                continue
+            paragraphs.append(text)
+            total += len(text)
+            if total >= max_chars:
+                break
+        
+        return '\n\n'.join(paragraphs)[:max_chars], self.find_advisory_ids(container.get_text(' '))
+    
+    def find_advisory_ids(self, text):
+        """CVE and APSB identifiers mentioned in text, in first-seen order"""
+        seen = []
+        for match in ADVISORY_PATTERN.finditer(text or ''):
+            advisory_id = match.group(1).upper()
+            if advisory_id not in seen:
+                seen.append(advisory_id)
+        return seen
+    
+    def fetch_article(self, url, settings):
+        """Fetch one article page and extract its text (runs in a worker thread)"""
+        response = requests.get(url, timeout=settings['timeout'])
+        response.raise_for_status()
+        text, advisory_ids = self.extract_main_text(response.text, settings['max_chars'])
+        return {
+            'text': text,
+            'advisory_ids': advisory_ids,
+            'fetched_at': datetime.now().isoformat(),
+        }
+    
+    def enrich(self, articles, config=None):
+        """
+        Attach 'article_text' and 'advisory_ids' to articles, fetching uncached
+        pages concurrently until the fetch budget or the deadline runs out.
+        Articles that miss the budget are left as they are.
+        
+        config: True or a dict overriding DEFAULTS
+        """
+        settings = dict(self.DEFAULTS)
+        if isinstance(config, dict):
+            settings.update(config)
+        
+        pending = []
+        for article in articles:
+            url = article.get('url')
+            if url and url not in self.cache and url not in pending:
+                pending.append(url)
+        
+        skipped = max(len(pending) - settings['max_fetches'], 0)
+        pending = pending[:settings['max_fetches']]
+        
+        if pending:
+            print(f"   🔎 Enriching {len(pending)} articles ({len(articles) - len(pending)} cached or skipped)")
+            deadline = time.monotonic() + settings['deadline']
+            executor = ThreadPoolExecutor(max_workers=settings['max_workers'])
+            futures = {executor.submit(self.fetch_article, url, settings): url for url in pending}
+            remaining = set(futures)
+            
+            while remaining:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                done, remaining = wait(remaining, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = futures[future]
+                    try:
+                        self.cache[url] = future.result()
+                        self.updated_urls.add(url)
+                    except Exception as e:
+                        print(f"   ✗ Error fetching {url}: {e}")
+            
+            if remaining:
+                print(f"   ⚠️  Enrichment deadline reached, {len(remaining)} articles left unenriched")
+                for future in remaining:
+                    future.cancel()
+            executor.shutdown(wait=False)
+        
+        if skipped:
+            print(f"   ⚠️  Fetch budget reached, {skipped} articles left unenriched")
+        
+        for article in articles:
+            entry = self.cache.get(article.get('url'))
+            if entry:
+                article['article_text'] = entry['text']
+                article['advisory_ids'] = entry['advisory_ids']
+        
+        self.save_cache()
+        return articles
+
+
+def article_excerpt(text, max_chars=1500):
+    """Leading paragraphs of extracted article text, cut at a paragraph boundary"""
+    excerpt = ''
+    for paragraph in text.split('\n\n'):
+        if excerpt and len(excerpt) + len(paragraph) + 2 > max_chars:
+            return excerpt + '\n\n…'
+        excerpt = f"{excerpt}\n\n{paragraph}" if excerpt else paragraph[:max_chars]
+    return excerpt
+
+
+def advisory_links(advisory_ids):
+    """Markdown list of mentioned advisories, CVEs linked to NVD"""
+    links = []
+    for advisory_id in advisory_ids:
+        if advisory_id.startswith('CVE-'):
+            links.append(f"[{advisory_id}](https://nvd.nist.gov/vuln/detail/{advisory_id})")
+        else:
+            links.append(advisory_id)
+    return ', '.join(links)
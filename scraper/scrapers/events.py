@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+NDJSON event stream of new and updated records
+Each post a run creates or modifies is emitted as one JSON line as soon as it
+is written, so consumers can tail the stream instead of re-reading content/.
+"""
+
+import sys
+import json
+from datetime import datetime
+from pathlib import Path
+
+from .record_store import encode_value
+
+# write_markdown() status -> event name; unchanged posts are not emitted
+EVENTS = {
+    'created': 'new',
+    'modified': 'updated',
+}
+
+
+class EventStream:
+    """Write listener that emits one NDJSON line per new or updated record"""
+    
+    def __init__(self, target='-'):
+        """Initialize stream on stdout ('-') or appending to a file"""
+        if target == '-':
+            self.stream = sys.stdout
+            self.owns_stream = False
+        else:
+            self.stream = open(Path(target), 'a', encoding='utf-8')
+            self.owns_stream = True
+        self.count = 0
+    
+    def record_written(self, kind, record, filename, status, text):
+        """Write listener: emit the record if its post is new or updated"""
+        event = EVENTS.get(status)
+        if not event:
+            return
+        line = json.dumps({
+            'event': event,
+            'kind': kind,
+            'id': record.get('id'),
+            'source': record.get('source_name'),
+            'path': str(filename),
+            'emitted_at': datetime.now().isoformat(timespec='seconds'),
+            'record': record,
+        }, default=encode_value, sort_keys=True)
+        self.stream.write(line + '\n')
+        # Consumers tail the stream; don't hold lines in the buffer
+        self.stream.flush()
+        self.count += 1
+    
+    def close(self):
+        """Close the file (stdout is left open)"""
+        if self.owns_stream:
+            self.stream.close()
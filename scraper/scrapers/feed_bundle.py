@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Feed Bundle Scraper
+Polls many Atom/RSS feeds concurrently with a shared keyword filter
+"""
+
+import re
+import requests
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+from xml.etree import ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .atom_feed import AtomFeedScraper
+from .records import scrape_records
+from .keywords import KeywordMatcher
+
+
+class FeedBundleScraper(AtomFeedScraper):
+    """Scraper for a list of Atom/RSS feeds (inline or from OPML) fetched in parallel"""
+    
+    # Last path segments that say nothing about the feed, left out of default ID prefixes
+    GENERIC_FEED_PATHS = {'feed', 'feeds', 'rss', 'rss2', 'atom', 'feed-xml', 'rss-xml', 'atom-xml', 'index-xml'}
+    
+    def slugify(self, text):
+        """Lowercase, dash-separated identifier for ID prefixes"""
+        return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+    
+    def feed_prefix(self, url):
+        """
+        Default ID prefix for a feed, from its URL alone (never its position):
+        host without www/feeds/blog, then the path and query minus a generic last segment
+        """
+        parsed = urlparse(url)
+        host = parsed.netloc.lower().split(':')[0]
+        host = re.sub(r'^(www|feeds?|blogs?)\.', '', host)
+        segments = [self.slugify(segment) for segment in parsed.path.split('/') if self.slugify(segment)]
+        if segments and segments[-1] in self.GENERIC_FEED_PATHS:
+            segments.pop()
+        parts = [self.slugify(host)] + segments + [self.slugify(parsed.query)]
+        return '-'.join(part for part in parts if part)
+    
+    def load_opml(self, location):
+        """Read feed entries (xmlUrl outlines) from an OPML file path or URL"""
+        try:
+            if re.match(r'https?://', location):
+                response = requests.get(location, timeout=30)
+                response.raise_for_status()
+                root = ET.fromstring(response.content)
+            else:
+                path = Path(location)
+                if not path.is_absolute():
+                    path = Path(__file__).parent.parent / path
+                root = ET.parse(path).getroot()
+        except Exception as e:
+            print(f"   ✗ Error loading OPML {location}: {e}")
+            return []
+        
+        feeds = []
+        for outline in root.iter('outline'):
+            url = outline.get('xmlUrl')
+            if not url:
+                continue
+            title = outline.get('title') or outline.get('text') or ''
+            feed = {'url': url}
+            if title:
+                feed['display_name'] = title
+                feed['name'] = self.slugify(title)
+            feeds.append(feed)
+        return feeds
+    
+    def resolve_feeds(self, config):
+        """
+        Normalize `feeds` (URLs or dicts) plus any OPML outlines into feed dicts with unique names
+        Names are article ID prefixes, so a clash is not renumbered (that would
+        tie IDs to feed order): the later feed is skipped until it gets a name.
+        """
+        feeds = []
+        for feed in config.get('feeds', []):
+            feeds.append({'url': feed} if isinstance(feed, str) else dict(feed))
+        if config.get('opml'):
+            feeds.extend(self.load_opml(config['opml']))
+        
+        resolved = []
+        seen_urls = set()
+        used_names = {}
+        for feed in feeds:
+            url = feed.get('url')
+            if not url or url in seen_urls:
+                continue
+            seen_urls.add(url)
+            
+            name = feed.get('name') or self.feed_prefix(url)
+            if name in used_names:
+                print(f"   ⚠️  Skipping {url}: ID prefix '{name}' is already used by {used_names[name]}; give it a 'name'")
+                continue
+            used_names[name] = url
+            
+            feed['name'] = name
+            feed.setdefault('display_name', name.replace('-', ' ').title())
+            resolved.append(feed)
+        return resolved
+    
+    def scrape_feed(self, feed, matcher, limit, stop_at_known, host_limits):
+        """Fetch and filter one feed; messages are buffered so parallel output stays grouped"""
+        lines = []
+        state = dict(self.feed_state.get(feed['url'], {}))
+        host = urlparse(feed['url']).netloc.lower()
+        with host_limits[host]:
+            entries = self.fetch_feed(feed['url'], log=lines.append)
+            articles = self.extract_articles(
+                entries,
+                includes=matcher,
+                source_prefix=feed['name'],
+                limit=feed.get('limit', limit),
+                stop_at_known=stop_at_known,
+                state=state,
+                log=lines.append
+            )
+        return articles, state, lines
+    
+    def iter_fetched(self, config):
+        """Fetch every feed in the bundle concurrently, then yield new articles in config order"""
+        source_name = config.get('name', 'feed-bundle')
+        limit = config.get('limit', 20)
+        source_categories = config.get('categories', [])
+        includes = config.get('includes')
+        stop_at_known = config.get('stop_at_known', True)
+        
+        feeds = self.resolve_feeds(config)
+        filter_msg = f" (filtering for: {', '.join(includes)})" if includes else ""
+        print(f"\n🔍 Scraping {source_name}: {len(feeds)} feeds{filter_msg}...")
+        if not feeds:
+            return
+        
+        # Compile the shared filter once for every feed in the bundle
+        matcher = KeywordMatcher(includes) if includes else None
+        
+        max_per_host = config.get('max_per_host', 2)
+        host_limits = {}
+        for feed in feeds:
+            host = urlparse(feed['url']).netloc.lower()
+            host_limits.setdefault(host, threading.BoundedSemaphore(max_per_host))
+        
+        results = {}
+        states = {}
+        max_workers = min(config.get('max_workers', 8), len(feeds))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.scrape_feed, feed, matcher, limit, stop_at_known, host_limits): feed
+                for feed in feeds
+            }
+            for future in as_completed(futures):
+                feed = futures[future]
+                print(f"   📡 {feed['display_name']} ({feed['url']})")
+                try:
+                    articles, state, lines = future.result()
+                except Exception as e:
+                    print(f"   ✗ Error scraping {feed['url']}: {e}")
+                    continue
+                for line in lines:
+                    print(f"  {line}")
+                results[feed['url']] = articles
+                states[feed['url']] = state
+        
+        # Enrich the whole bundle in one pool so the budget is shared across feeds
+        if config.get('enrich'):
+            bundle_articles = [article for feed in feeds for article in results.get(feed['url'], [])]
+            if bundle_articles:
+                self.enricher.enrich(bundle_articles, config['enrich'])
+        
+        # Move a feed's watermark only on a run that found nothing new in it
+        # (new articles are tracked once posted, so they are known by then)
+        for url, state in states.items():
+            if not results[url] and state != self.feed_state.get(url, {}):
+                self.feed_state[url] = state
+                self.feed_state_changed = True
+        
+        # Yield articles in config order so runs are reproducible
+        for feed in feeds:
+            for article in results.get(feed['url'], []):
+                if article['id'] in self.existing_posts:
+                    continue
+                print(f"   Processing {article['title'][:60]}...")
+                
+                # Add source info to article for markdown generation
+                article['source_name'] = feed['name']
+                article['source_categories'] = source_categories + [c for c in feed.get('categories', []) if c not in source_categories]
+                article['source_display_name'] = feed['display_name']
+                yield article
+    
+    def finish_source(self, config, created_files):
+        """Save feed state and summarize the bundle run"""
+        super().finish_source(config, created_files)
+        print(f"   📥 {len(created_files)} new articles from {config.get('name', 'feed-bundle')}")
+    
+    def scrape(self, config):
+        """
+        Scrape a bundle of Atom/RSS feeds concurrently
+        
+        Config format:
+        {
+            'name': 'vendor-blogs',
+            'feeds': [  # Feed URLs, or dicts with url and optional name/display_name/categories/limit
+                'https://example.com/feed.xml',
+                {'url': 'https://example.org/rss', 'name': 'example-org', 'display_name': 'Example Org'}
+            ],
+            'opml': 'feeds.opml',  # Optional: OPML file (relative to scraper/) or URL with more feeds
+            'includes': ['keyword1'],  # Optional: shared filter applied to every feed
+            'limit': 20,  # Optional: per-feed limit
+            'categories': [],  # Optional categories added to every article
+            'max_workers': 8,  # Optional: feeds fetched in parallel
+            'max_per_host': 2,  # Optional: concurrent requests to the same host
+            'stop_at_known': True,  # Optional: stop reading each feed at its first already-scraped entry
+            'enrich': True  # Optional: fetch linked articles, one budget for the whole bundle
+        }
+        """
+        return scrape_records(self, config)
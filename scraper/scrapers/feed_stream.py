@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Streaming Atom/RSS parsing shared by the feed scrapers
+Entries are parsed incrementally and discarded as soon as they are processed
+"""
+
+import io
+import json
+import requests
+from datetime import datetime
+from xml.etree import ElementTree as ET
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+
+# Tags that delimit one feed entry (Atom entry, RSS 2.0 item)
+ENTRY_TAGS = {f'{{{ATOM_NS}}}entry', 'item'}
+
+# Feed-level "last changed" timestamps (Atom <updated>, RSS <lastBuildDate>) and their parents
+FEED_UPDATED_TAGS = {f'{{{ATOM_NS}}}updated', 'lastBuildDate'}
+FEED_TAGS = {f'{{{ATOM_NS}}}feed', 'channel'}
+
+
+def open_feed_stream(source, archive=None):
+    """
+    Open a feed for incremental reading
+    `source` may be a URL, raw bytes or a binary file object; feeds fetched
+    from a URL are archived as they are read when `archive` is given
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if hasattr(source, 'read'):
+        return source
+    
+    response = requests.get(source, timeout=30, stream=True)
+    response.raise_for_status()
+    # Let urllib3 undo gzip/deflate transfer encoding while we stream
+    response.raw.decode_content = True
+    if archive:
+        return archive.tee(response.raw, source, 'feed')
+    return response.raw
+
+
+def iter_feed_entries(source, log=print, feed=None, archive=None):
+    """
+    Yield feed entry elements (Atom <entry> or RSS <item>) one at a time
+    Each entry is complete when yielded; it is cleared and detached from its
+    parent once the consumer asks for the next one, so memory stays flat and
+    stopping early avoids reading the rest of the feed.
+    If `feed` is given, its `updated` attribute is set from the feed-level
+    timestamp (which normally precedes the first entry).
+    """
+    try:
+        stream = open_feed_stream(source, archive=archive)
+    except Exception as e:
+        log(f"   ✗ Error fetching {source if isinstance(source, str) else 'feed'}: {e}")
+        return
+    
+    parents = []
+    try:
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                parents.append(elem)
+                continue
+            
+            parents.pop()
+            if elem.tag not in ENTRY_TAGS:
+                if feed is not None and elem.tag in FEED_UPDATED_TAGS and parents and parents[-1].tag in FEED_TAGS:
+                    feed.updated = (elem.text or '').strip() or None
+                continue
+            
+            yield elem
+            
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+    except ET.ParseError as e:
+        log(f"   ✗ Error parsing feed: {e}")
+    finally:
+        if not hasattr(source, 'read'):
+            stream.close()
+
+
+class FeedStream:
+    """Iterable of feed entries that also exposes the feed-level timestamp"""
+    
+    def __init__(self, source, log=print, archive=None):
+        self.updated = None
+        self.entries = iter_feed_entries(source, log=log, feed=self, archive=archive)
+    
+    def __iter__(self):
+        return self.entries
+    
+    def close(self):
+        """Stop reading the feed and release the connection"""
+        self.entries.close()
+
+
+def load_feed_state(tracking_file):
+    """Load per-feed state (feed timestamp, newest entry ID) from scraped_posts.json"""
+    if tracking_file.exists():
+        try:
+            with open(tracking_file, 'r') as f:
+                return json.load(f).get('feed_state', {})
+        except Exception as e:
+            print(f"   ⚠️  Error loading feed state: {e}")
+    return {}
+
+
+def save_feed_state(tracking_file, feed_state):
+    """Save per-feed state back to scraped_posts.json"""
+    if tracking_file.exists():
+        try:
+            with open(tracking_file, 'r') as f:
+                data = json.load(f)
+        except:
+            data = {'ids': [], 'last_updated': None, 'total_count': 0}
+    else:
+        data = {'ids': [], 'last_updated': None, 'total_count': 0}
+    
+    # Scrapers hold their own copy, so merge per feed rather than replace
+    data.setdefault('feed_state', {}).update(feed_state)
+    data['last_updated'] = datetime.now().isoformat()
+    
+    try:
+        with open(tracking_file, 'w') as f:
+            json.dump(data, f, indent=2)
+    except Exception as e:
+        print(f"   ⚠️  Error saving feed state: {e}")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Keyword matching shared by the feed and CVE filters
+Compiles a keyword list once into a single word-boundary-aware regex
+"""
+
+import re
+
+
+class KeywordMatcher:
+    """Case-insensitive whole-word matcher for a list of keywords"""
+    
+    def __init__(self, keywords):
+        """Compile keywords into one alternation, longest first so phrases win over their prefixes"""
+        self.keywords = {}
+        for keyword in keywords or []:
+            normalized = ' '.join(str(keyword).lower().split())
+            if normalized:
+                self.keywords.setdefault(normalized, keyword)
+        
+        self.pattern = None
+        if self.keywords:
+            alternatives = sorted(self.keywords, key=len, reverse=True)
+            # Whitespace inside a phrase matches any run of whitespace
+            alternation = '|'.join(r'\s+'.join(re.escape(word) for word in keyword.split()) for keyword in alternatives)
+            self.pattern = re.compile(rf'(?<!\w)(?:{alternation})(?!\w)', re.IGNORECASE)
+    
+    def __bool__(self):
+        return self.pattern is not None
+    
+    def matches(self, text):
+        """Return the set of keywords (as configured) found in text"""
+        if not self.pattern or not text:
+            return set()
+        
+        found = set()
+        for match in self.pattern.finditer(text):
+            found.add(self.keywords[' '.join(match.group(0).lower().split())])
+            if len(found) == len(self.keywords):
+                break
+        return found
+    
+    def search(self, text):
+        """Check whether text contains any keyword"""
+        return bool(self.pattern and text and self.pattern.search(text))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Content manifest of a scraper run
+Lists every post path the run created or modified, with its status and
+content hash, so the publish step and deploys can act on just the delta
+instead of re-globbing content/. Posts left as they were (skipped as known,
+or rewritten with identical content) are not listed.
+"""
+
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+# Repository root; manifest paths are relative to it (e.g. content/2025/01/01/post.md)
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+# write_markdown() statuses that are recorded; 'unchanged' writes are left out
+STATUSES = ('created', 'modified')
+
+
+class ContentManifest:
+    """Post paths written during one run, keyed by path"""
+    
+    def __init__(self, manifest_file=None):
+        """Initialize manifest (scraper/content_manifest.json by default)"""
+        self.manifest_file = Path(manifest_file) if manifest_file else Path(__file__).parent.parent / 'content_manifest.json'
+        self.files = {}
+    
+    def record_written(self, kind, record, filename, status, text):
+        """Write listener: record one created or modified post"""
+        if status not in STATUSES:
+            return
+        path = Path(filename).resolve()
+        try:
+            path = path.relative_to(REPO_ROOT.resolve())
+        except ValueError:
+            pass
+        entry = {
+            'path': path.as_posix(),
+            'status': status,
+            'sha256': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            'kind': kind,
+            'id': record.get('id'),
+            'source': record.get('source_name'),
+        }
+        self.files[entry['path']] = entry
+    
+    def summary(self):
+        """Count of posts per status"""
+        counts = {status: 0 for status in STATUSES}
+        for entry in self.changed():
+            counts[entry['status']] += 1
+        return counts
+    
+    def changed(self):
+        """Entries for posts that were created or modified (older manifests also list unchanged ones)"""
+        return [entry for entry in self.files.values() if entry['status'] in STATUSES]
+    
+    def save(self):
+        """Write the manifest file"""
+        data = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'summary': self.summary(),
+            'files': sorted(self.files.values(), key=lambda entry: entry['path']),
+        }
+        try:
+            with open(self.manifest_file, 'w') as f:
+                json.dump(data, f, indent=2)
+            print(f"🧾 Wrote content manifest: {self.manifest_file.name} {data['summary']}")
+        except Exception as e:
+            print(f"⚠️  Error saving content manifest: {e}")
+    
+    @classmethod
+    def load(cls, manifest_file=None):
+        """Read a manifest written by an earlier run"""
+        manifest = cls(manifest_file)
+        with open(manifest.manifest_file, 'r') as f:
+            data = json.load(f)
+        manifest.files = {entry['path']: entry for entry in data.get('files', [])}
+        return manifest
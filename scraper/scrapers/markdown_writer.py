@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Markdown post writer shared by all scrapers
+Serializes Micro.blog front matter and writes posts atomically (temp file +
+rename), leaving files whose content is unchanged untouched so their mtime
+does not churn git or Hugo's incremental builds.
+"""
+
+import os
+import re
+import hashlib
+import tempfile
+
+# Read once at import (os.umask can only be read by setting it)
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+# Log labels for write_markdown() results
+WRITE_LABELS = {
+    'created': '✓ Created',
+    'modified': '✓ Updated',
+    'unchanged': '= Unchanged',
+}
+
+# List items written bare, as before; anything else is quoted
+PLAIN_ITEM = re.compile(r'^[A-Za-z0-9][A-Za-z0-9 ._/+-]*$')
+
+
+def quote(value):
+    """YAML double-quoted scalar with quotes, backslashes and control characters escaped"""
+    text = str(value)
+    text = text.replace('\\', '\\\\').replace('"', '\\"')
+    text = text.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+    return f'"{text}"'
+
+
+def render_front_matter(front_matter):
+    """Front matter block: booleans bare, lists as block sequences, everything else quoted"""
+    lines = ['---']
+    for key, value in front_matter.items():
+        if isinstance(value, bool):
+            lines.append(f'{key}: {str(value).lower()}')
+        elif isinstance(value, list):
+            lines.append(f'{key}:')
+            for item in value:
+                item = str(item)
+                lines.append(f'  - {item}' if PLAIN_ITEM.match(item) else f'  - {quote(item)}')
+        elif value is None or value == '':
+            lines.append(f'{key}: ""')
+        else:
+            lines.append(f'{key}: {quote(value)}')
+    lines.append('---')
+    return '\n'.join(lines) + '\n'
+
+
+def render_post(front_matter, content):
+    """Full post text: front matter followed by the markdown body"""
+    return render_front_matter(front_matter) + content + '\n'
+
+
+def content_hash(data):
+    """SHA-256 of post bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_markdown(filename, text):
+    """
+    Write a post atomically, creating the YYYY/MM/DD directory as needed
+    Returns 'created', 'modified' or 'unchanged' (file left as it was).
+    """
+    data = text.encode('utf-8')
+    status = 'created'
+    if filename.exists():
+        with open(filename, 'rb') as f:
+            if content_hash(f.read()) == content_hash(data):
+                return 'unchanged'
+        status = 'modified'
+    
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=filename.parent, prefix=f'.{filename.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600; give the post the mode a plain open() would
+        os.chmod(temp_path, 0o666 & ~UMASK)
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return status
@@ -6,15 +6,33 @@ Filters for Adobe Commerce, Magento, and AEM related vulnerabilities
 """
 
 import re
+import json
 import requests
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
+from .archive import PageArchive
+from .record_store import RecordStore
+from .keywords import KeywordMatcher
+from .markdown_writer import WRITE_LABELS, render_post, write_markdown
+from .records import iter_records, scrape_records
 
 
 class NistNvdScraper:
     """Scraper for NIST NVD CVE database"""
     
+    # Kind under which written records are kept in the record store
+    RECORD_KIND = 'nvd'
+    
+    # Description keywords that mark a CVE as relevant (a source's 'keywords'
+    # are matched in addition), and the product tags each implies
+    PRODUCT_KEYWORDS = {
+        'adobe commerce': ['adobe-commerce', 'magento'],
+        'magento': ['adobe-commerce', 'magento'],
+        'adobe experience manager': ['adobe-experience-manager', 'aem'],
+        'aem': ['adobe-experience-manager', 'aem'],
+    }
+    
     def __init__(self, output_dir, existing_posts=None):
         """Initialize scraper"""
         self.output_dir = Path(output_dir)
@@ -24,8 +42,13 @@ class NistNvdScraper:
         # Rate limiting: 5 requests per 30 seconds without API key
         # 50 requests per 30 seconds with API key
         self.rate_limit_delay = 6  # seconds between requests (safe for no API key)
+        self.product_matcher = KeywordMatcher(self.PRODUCT_KEYWORDS)
+        # Matchers for sources with their own keywords, by keyword tuple
+        self.matchers = {}
+        self.archive = PageArchive()
+        self.record_store = RecordStore()
     
-    def fetch_cves(self, params):
+    def fetch_cves(self, params, source_info=None):
         """Fetch CVEs from NIST NVD API with rate limiting"""
         try:
             # Add delay to respect rate limits
@@ -33,17 +56,94 @@ class NistNvdScraper:
             
             response = requests.get(self.api_base, params=params, timeout=30)
             response.raise_for_status()
+            self.archive.store(response.url, response.content, 'nvd', meta=dict(source_info or {}, params=params))
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"   ✗ Error fetching from NVD API: {e}")
             return None
     
     def extract_cves(self, keywords, lookback_days=30):
+        """Extract CVEs matching keywords from the last N days as a list"""
+        return list(self.iter_cves(keywords, lookback_days))
+    
+    def match_keywords(self, keywords):
+        """PRODUCT_KEYWORDS plus a source's own keywords (compared case-insensitively)"""
+        combined = list(self.PRODUCT_KEYWORDS)
+        for keyword in keywords:
+            if ' '.join(keyword.lower().split()) not in combined:
+                combined.append(keyword)
+        return combined
+    
+    def matcher_for(self, keywords=None):
+        """Description matcher for a source's keywords (the PRODUCT_KEYWORDS one if None)"""
+        if keywords is None:
+            return self.product_matcher
+        key = tuple(keywords)
+        if key not in self.matchers:
+            self.matchers[key] = KeywordMatcher(keywords)
+        return self.matchers[key]
+    
+    def parse_cve(self, cve_data, matcher=None):
+        """Build a CVE record from one API 'cve' object ('matched_keywords' is empty if it is not ours)"""
+        cve_id = cve_data.get('id', '')
+        
+        # Extract description
+        descriptions = cve_data.get('descriptions', [])
+        description_text = ''
+        for desc in descriptions:
+            if desc.get('lang') == 'en':
+                description_text = desc.get('value', '')
+                break
+        
+        # Filter: must mention one of the source's keywords in description
+        matched_keywords = (matcher or self.product_matcher).matches(description_text)
+        
+        # Extract dates
+        published = cve_data.get('published', '')
+        last_modified = cve_data.get('lastModified', '')
+        
+        # Parse dates
+        published_date = datetime.fromisoformat(published.replace('Z', '+00:00')) if published else datetime.now()
+        modified_date = datetime.fromisoformat(last_modified.replace('Z', '+00:00')) if last_modified else published_date
+        
+        # Extract CVSS score if available
+        cvss_score = None
+        cvss_severity = None
+        metrics = cve_data.get('metrics', {})
+        
+        # Try CVSS v3.1 first, then v3.0, then v2.0
+        for version in ['cvssMetricV31', 'cvssMetricV30', 'cvssMetricV2']:
+            if version in metrics and metrics[version]:
+                metric = metrics[version][0]
+                cvss_data = metric.get('cvssData', {})
+                cvss_score = cvss_data.get('baseScore')
+                cvss_severity = cvss_data.get('baseSeverity') or metric.get('baseSeverity')
+                break
+        
+        # Extract references
+        references = cve_data.get('references', [])
+        reference_urls = [ref.get('url', '') for ref in references[:5]]  # Limit to 5 refs
+        
+        # Create CVE object
+        return {
+            'id': cve_id,
+            'description': description_text,
+            'published_date': published_date,
+            'modified_date': modified_date,
+            'cvss_score': cvss_score,
+            'cvss_severity': cvss_severity,
+            'references': reference_urls,
+            'matched_keywords': matched_keywords,
+            'url': f"https://nvd.nist.gov/vuln/detail/{cve_id}"
+        }
+    
+    def iter_cves(self, keywords, lookback_days=30, source_info=None, matcher=None):
         """
-        Extract CVEs matching keywords from the last N days
-        Uses lastModStartDate/lastModEndDate for incremental updates
+        Yield CVEs matching keywords from the last N days as each API page arrives
+        Uses lastModStartDate/lastModEndDate for incremental updates; matcher
+        filters descriptions (default: PRODUCT_KEYWORDS)
         """
-        cves = []
+        seen_ids = set()
         
         # Calculate date range for incremental updates
         end_date = datetime.utcnow()
@@ -76,7 +176,7 @@ class NistNvdScraper:
                 params['startIndex'] = start_index
                 
                 # Fetch data from API
-                data = self.fetch_cves(params)
+                data = self.fetch_cves(params, source_info)
                 if not data:
                     break
                 
@@ -103,65 +203,17 @@ class NistNvdScraper:
                         skipped_duplicate += 1
                         continue
                     
-                    # Check if already in our list (from another keyword)
-                    if any(c['id'] == cve_id for c in cves):
+                    # Check if already yielded (from another keyword)
+                    if cve_id in seen_ids:
                         continue
                     
-                    # Extract description
-                    descriptions = cve_data.get('descriptions', [])
-                    description_text = ''
-                    for desc in descriptions:
-                        if desc.get('lang') == 'en':
-                            description_text = desc.get('value', '')
-                            break
-                    
-                    # Filter: must mention Adobe, Magento, or AEM in description
-                    adobe_keywords = ['adobe commerce', 'magento', 'adobe experience manager', 'aem']
-                    description_lower = description_text.lower()
-                    
-                    if not any(kw in description_lower for kw in adobe_keywords):
+                    cve = self.parse_cve(cve_data, matcher)
+                    if not cve['matched_keywords']:
                         skipped_filter += 1
                         continue
                     
-                    # Extract dates
-                    published = cve_data.get('published', '')
-                    last_modified = cve_data.get('lastModified', '')
-                    
-                    # Parse dates
-                    published_date = datetime.fromisoformat(published.replace('Z', '+00:00')) if published else datetime.now()
-                    modified_date = datetime.fromisoformat(last_modified.replace('Z', '+00:00')) if last_modified else published_date
-                    
-                    # Extract CVSS score if available
-                    cvss_score = None
-                    cvss_severity = None
-                    metrics = cve_data.get('metrics', {})
-                    
-                    # Try CVSS v3.1 first, then v3.0, then v2.0
-                    for version in ['cvssMetricV31', 'cvssMetricV30', 'cvssMetricV2']:
-                        if version in metrics and metrics[version]:
-                            metric = metrics[version][0]
-                            cvss_data = metric.get('cvssData', {})
-                            cvss_score = cvss_data.get('baseScore')
-                            cvss_severity = cvss_data.get('baseSeverity') or metric.get('baseSeverity')
-                            break
-                    
-                    # Extract references
-                    references = cve_data.get('references', [])
-                    reference_urls = [ref.get('url', '') for ref in references[:5]]  # Limit to 5 refs
-                    
-                    # Create CVE object
-                    cve = {
-                        'id': cve_id,
-                        'description': description_text,
-                        'published_date': published_date,
-                        'modified_date': modified_date,
-                        'cvss_score': cvss_score,
-                        'cvss_severity': cvss_severity,
-                        'references': reference_urls,
-                        'url': f"https://nvd.nist.gov/vuln/detail/{cve_id}"
-                    }
-                    
-                    cves.append(cve)
+                    seen_ids.add(cve_id)
+                    yield cve
                 
                 # Check if we need to fetch more results
                 if start_index + len(vulnerabilities) >= total_results:
@@ -174,14 +226,12 @@ class NistNvdScraper:
                 print(f"   ℹ️  Skipped {skipped_duplicate} existing CVEs")
             if skipped_filter > 0:
                 print(f"   ℹ️  Filtered out {skipped_filter} non-Adobe/Magento CVEs")
-            print(f"   📥 Found {len(cves)} new Adobe/Magento CVEs to process")
+            print(f"   📥 Found {len(seen_ids)} new Adobe/Magento CVEs to process")
         else:
             print(f"   ℹ️  No CVEs found")
-        
-        return cves
     
-    def create_markdown(self, data):
-        """Create markdown file with Micro.blog front matter"""
+    def render_markdown(self, data):
+        """Build the post path and markdown with Micro.blog front matter"""
         # Use modified date for the post (when CVE was last updated)
         date = data['modified_date']
         
@@ -190,7 +240,6 @@ class NistNvdScraper:
         
         # Create directory structure: YYYY/MM/DD/
         date_dir = self.output_dir / str(date.year) / f"{date.month:02d}" / f"{date.day:02d}"
-        date_dir.mkdir(parents=True, exist_ok=True)
         
         filename = date_dir / f"{slug}.md"
         
@@ -201,13 +250,16 @@ class NistNvdScraper:
         source_categories = data.get('source_categories', [])
         source_name = data.get('source_name', 'nist-nvd')
         
-        # Determine product tags from description
-        description_lower = data['description'].lower()
+        # Determine product tags from the keywords matched while filtering
+        matched_keywords = data.get('matched_keywords')
+        if matched_keywords is None:
+            matched_keywords = self.product_matcher.matches(data['description'])
+        # Keywords come back as configured; tags are looked up case-insensitively
+        matched = {' '.join(str(keyword).lower().split()) for keyword in matched_keywords}
         product_tags = []
-        if 'adobe commerce' in description_lower or 'magento' in description_lower:
-            product_tags.extend(['adobe-commerce', 'magento'])
-        if 'adobe experience manager' in description_lower or 'aem' in description_lower:
-            product_tags.extend(['adobe-experience-manager', 'aem'])
+        for keyword in self.PRODUCT_KEYWORDS:
+            if keyword in matched:
+                product_tags.extend(tag for tag in self.PRODUCT_KEYWORDS[keyword] if tag not in product_tags)
         
         # Base tags
         base_tags = ['cve', 'vulnerability', 'nist', 'nvd', source_name] + product_tags
@@ -275,27 +327,70 @@ class NistNvdScraper:
         
         content = '\n'.join(content_parts)
         
-        # Write file in Micro.blog format
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write('---\n')
-            for key, value in front_matter.items():
-                if isinstance(value, bool):
-                    f.write(f'{key}: {str(value).lower()}\n')
-                elif isinstance(value, list):
-                    f.write(f'{key}:\n')
-                    for item in value:
-                        f.write(f'  - {item}\n')
-                elif value is None or value == '':
-                    f.write(f'{key}: ""\n')
-                else:
-                    f.write(f'{key}: "{value}"\n')
-            f.write('---\n')
-            f.write(content)
-            f.write('\n')
-        
-        print(f"   ✓ Created: {filename}")
+        # Render in Micro.blog format
+        text = render_post(front_matter, content)
+        
+        return filename, text
+    
+    def create_markdown(self, data):
+        """Create markdown file with Micro.blog front matter"""
+        filename, text = self.render_markdown(data)
+        status = write_markdown(filename, text)
+        print(f"   {WRITE_LABELS[status]}: {filename}")
         return filename
     
+    def iter_fetched(self, config):
+        """Yield new CVEs with source info as the NVD API pages come in"""
+        source_name = config.get('name', 'nist-nvd')
+        keywords = config.get('keywords', ['Adobe Commerce', 'Magento', 'Adobe Experience Manager'])
+        lookback_days = config.get('lookback_days', 30)
+        # Descriptions must mention a product keyword or one of this source's keywords
+        match_keywords = self.match_keywords(config.get('keywords', []))
+        
+        print(f"\n🔍 Scraping {source_name} (looking back {lookback_days} days)...")
+        
+        # Source info for markdown generation (also archived with each API page)
+        source_info = {
+            'source_name': source_name,
+            'source_categories': config.get('categories', []),
+            'source_display_name': config.get('display_name', 'NIST NVD')
+        }
+        
+        # Archived with each API page so reparse filters with the same keywords
+        archive_info = dict(source_info, keywords=match_keywords)
+        for cve in self.iter_cves(keywords, lookback_days, archive_info, self.matcher_for(match_keywords)):
+            print(f"   Processing {cve['id']}...")
+            cve.update(source_info)
+            yield cve
+    
+    def parse_fetched(self, item):
+        """CVEs come from the API already structured"""
+        return [item]
+    
+    def reparse_page(self, item):
+        """CVE records from an archived API response (item meta plus 'body')"""
+        records = []
+        for vuln_wrapper in json.loads(item['body']).get('vulnerabilities', []):
+            cve = self.parse_cve(vuln_wrapper.get('cve', {}), self.matcher_for(self.match_keywords(item.get('keywords') or [])))
+            if cve['id'] and cve['matched_keywords']:
+                cve['source_name'] = item.get('source_name', 'nist-nvd')
+                cve['source_categories'] = item.get('source_categories', [])
+                cve['source_display_name'] = item.get('source_display_name', 'NIST NVD')
+                records.append(cve)
+        return records
+    
+    def iter_records(self, config):
+        """Generator of CVE post records"""
+        return iter_records(self, config)
+    
+    def mark_written(self, cve, filename):
+        """Remember a written CVE so later sources skip it"""
+        self.existing_posts.add(cve['id'])
+    
+    def finish_source(self, config, created_files):
+        """Nothing to persist for NVD sources"""
+        pass
+    
     def scrape(self, config):
         """
         Scrape CVEs from NIST NVD API
@@ -308,34 +403,4 @@ class NistNvdScraper:
             'categories': []  # Optional categories to add
         }
         """
-        source_name = config.get('name', 'nist-nvd')
-        keywords = config.get('keywords', ['Adobe Commerce', 'Magento', 'Adobe Experience Manager'])
-        lookback_days = config.get('lookback_days', 30)
-        source_categories = config.get('categories', [])
-        display_name = config.get('display_name', 'NIST NVD')
-        
-        print(f"\n🔍 Scraping {source_name} (looking back {lookback_days} days)...")
-        
-        # Extract CVEs
-        cves = self.extract_cves(keywords, lookback_days)
-        
-        created_files = []
-        
-        # Process each CVE
-        for cve in cves:
-            print(f"   Processing {cve['id']}...")
-            
-            # Add source info to CVE for markdown generation
-            cve['source_name'] = source_name
-            cve['source_categories'] = source_categories
-            cve['source_display_name'] = display_name
-            
-            # Create markdown
-            try:
-                filename = self.create_markdown(cve)
-                created_files.append(filename)
-                self.existing_posts.add(cve['id'])
-            except Exception as e:
-                print(f"   ✗ Error creating markdown for {cve['id']}: {e}")
-        
-        return created_files
+        return scrape_records(self, config)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Local store of parsed post records
+Every record written as a post is kept in SQLite (scraper/records.db), keyed
+by scraper kind and record ID, so markdown can be re-rendered after a template
+change without scraping again.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+
+def encode_value(value):
+    """JSON fallback for the non-JSON types records carry"""
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': sorted(value)}
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"Cannot store {type(value).__name__} in a record")
+
+
+def decode_value(obj):
+    """Undo encode_value() while loading"""
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    if '__set__' in obj:
+        return set(obj['__set__'])
+    return obj
+
+
+class RecordStore:
+    """SQLite table of post records by (kind, id)"""
+    
+    def __init__(self, db_file=None):
+        """Initialize store (scraper/records.db by default)"""
+        self.db_file = Path(db_file) if db_file else Path(__file__).parent.parent / 'records.db'
+    
+    def connect(self):
+        """Open a connection (one per call, so any thread can save)"""
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                kind TEXT NOT NULL,
+                id TEXT NOT NULL,
+                source TEXT,
+                record TEXT NOT NULL,
+                saved_at TEXT NOT NULL,
+                PRIMARY KEY (kind, id)
+            )
+        """)
+        return conn
+    
+    def save(self, kind, record):
+        """Insert or replace one record"""
+        data = json.dumps(record, default=encode_value, sort_keys=True)
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO records (kind, id, source, record, saved_at) VALUES (?, ?, ?, ?, ?)",
+                    (kind, record['id'], record.get('source_name'), data, datetime.now().isoformat(timespec='seconds'))
+                )
+        finally:
+            conn.close()
+    
+    def get(self, kind, record_id):
+        """One stored record, or None"""
+        if not self.db_file.exists():
+            return None
+        conn = self.connect()
+        try:
+            row = conn.execute("SELECT record FROM records WHERE kind = ? AND id = ?", (kind, record_id)).fetchone()
+            return json.loads(row[0], object_hook=decode_value) if row else None
+        finally:
+            conn.close()
+    
+    def iter_records(self, kinds=None):
+        """Yield (kind, record) for stored records, optionally limited to some kinds"""
+        if not self.db_file.exists():
+            return
+        conn = self.connect()
+        try:
+            for kind, data in conn.execute("SELECT kind, record FROM records ORDER BY kind, id"):
+                if kinds and kind not in kinds:
+                    continue
+                yield kind, json.loads(data, object_hook=decode_value)
+        finally:
+            conn.close()
+    
+    def count(self):
+        """Number of stored records"""
+        if not self.db_file.exists():
+            return 0
+        conn = self.connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+        finally:
+            conn.close()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Record stages shared by all scrapers
+Each scraper yields fetched items, parses them into post records, renders
+records to markdown and gets a hook once a post is on disk:
+
+    iter_fetched(config)          -> fetched items (network)
+    parse_fetched(item)           -> list of post records (CPU)
+    render_markdown(record)       -> (filename, text)
+    mark_written(record, filename)   bookkeeping once written
+    finish_source(config, files)     end-of-source hook (tracking saves)
+
+Scrapers with heavy HTML parsing split parse_fetched() in two so the
+parse can run in a worker process:
+
+    parse_html(item)              -> plain, picklable parse result
+    review_parsed(item, parsed)   -> list of post records (tracking checks)
+
+Scrapers whose fetches are archived (archive.py) can also rebuild records
+from an archived page, without network or tracking state:
+
+    reparse_page(item)            -> list of post records
+
+scrape_records() drives these in sequence; pipeline.py runs them as
+overlapping stages.
+"""
+
+from .archive import PageArchive
+from .markdown_writer import WRITE_LABELS, write_markdown
+
+# One parser instance per scraper class in each worker process
+_parsers = {}
+
+
+def get_parser(scraper_class, output_dir):
+    """This process's parser instance for a scraper class"""
+    parser = _parsers.get(scraper_class)
+    if parser is None:
+        parser = _parsers[scraper_class] = scraper_class(output_dir)
+    return parser
+
+
+def parse_in_process(scraper_class, output_dir, item):
+    """Worker process entry point: run a scraper's parse_html() on a fetched item"""
+    return get_parser(scraper_class, output_dir).parse_html(item)
+
+
+def reparse_in_process(scraper_class, output_dir, archive_root, entry):
+    """Worker process entry point: load an archived page and run the scraper's reparse_page() on it"""
+    body = PageArchive(archive_root).load(entry['sha256']).decode('utf-8')
+    return get_parser(scraper_class, output_dir).reparse_page(dict(entry['meta'], body=body))
+
+
+def iter_records(scraper, config):
+    """Generator of post records for one source config"""
+    for item in scraper.iter_fetched(config):
+        for record in scraper.parse_fetched(item):
+            yield record
+
+
+def write_record(scraper, record, rendered=None, listeners=()):
+    """
+    Render (unless already rendered) and write one record; returns the filename or None
+    Each listener's record_written(kind, record, filename, status, text) is called once it is written.
+    """
+    try:
+        filename, text = rendered or scraper.render_markdown(record)
+        status = write_markdown(filename, text)
+        print(f"   {WRITE_LABELS[status]}: {filename}")
+    except Exception as e:
+        print(f"   ✗ Error creating markdown for {record.get('id', 'unknown')}: {e}")
+        return None
+    
+    scraper.mark_written(record, filename)
+    
+    # Keep the parsed record so posts can be re-rendered without scraping
+    try:
+        scraper.record_store.save(scraper.RECORD_KIND, record)
+    except Exception as e:
+        print(f"   ⚠️  Error storing record {record.get('id', 'unknown')}: {e}")
+    
+    for listener in listeners:
+        try:
+            listener.record_written(scraper.RECORD_KIND, record, filename, status, text)
+        except Exception as e:
+            print(f"   ⚠️  Error reporting record {record.get('id', 'unknown')}: {e}")
+    return filename
+
+
+def write_records(scraper, records, listeners=()):
+    """Write each record as soon as it is produced; returns the created files"""
+    created_files = []
+    for record in records:
+        filename = write_record(scraper, record, listeners=listeners)
+        if filename:
+            created_files.append(filename)
+    return created_files
+
+
+def scrape_records(scraper, config):
+    """Run one source through every stage in sequence"""
+    created_files = write_records(scraper, iter_records(scraper, config))
+    scraper.finish_source(config, created_files)
+    return created_files
@@ -5,44 +5,73 @@ Fetches security research articles from sansec.io atom feed
 """
 
 import re
-import requests
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from xml.etree import ElementTree as ET
 from html import unescape
+from .feed_stream import FeedStream, load_feed_state, save_feed_state
+from .archive import PageArchive
+from .record_store import RecordStore
+from .enrichment import ArticleEnricher, article_excerpt, advisory_links
+from .markdown_writer import WRITE_LABELS, render_post, write_markdown
+from .records import iter_records, scrape_records, write_records
 
 
 class SansecScraper:
     """Scraper for Sansec.io security research articles"""
     
-    def __init__(self, output_dir, existing_posts=None):
+    # Kind under which written records are kept in the record store
+    RECORD_KIND = 'sansec'
+    
+    def __init__(self, output_dir, existing_posts=None, force=False):
         """Initialize scraper"""
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.existing_posts = existing_posts or set()
+        self.force = force
+        # Per-feed timestamp and newest entry ID, keyed by feed URL
+        self.tracking_file = Path(__file__).parent.parent / 'scraped_posts.json'
+        self.feed_state = load_feed_state(self.tracking_file)
+        self.feed_state_changed = False
+        self.enricher = ArticleEnricher()
+        self.archive = PageArchive()
+        self.record_store = RecordStore()
         
     def fetch_feed(self, url):
-        """Fetch and parse Atom feed"""
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            return ET.fromstring(response.content)
-        except Exception as e:
-            print(f"   ✗ Error fetching {url}: {e}")
-            return None
+        """Fetch Atom feed as a stream of entry elements"""
+        return FeedStream(url, archive=self.archive)
     
-    def extract_articles(self, root):
-        """Extract articles from Atom feed"""
-        articles = []
+    def extract_articles(self, entries, limit=None, state=None):
+        """
+        Extract articles from a stream of Atom entries
+        The feed is oldest-first, so only the newest `limit` articles are kept
+        while streaming instead of building the whole list.
+        
+        `state` is this feed's stored {'updated', 'newest_id'}: an unchanged
+        feed-level timestamp skips the feed, and entries up to the newest one
+        seen last time are dropped. It is updated in place for the next run.
+        """
+        articles = deque(maxlen=limit or None)
         
         # Define namespace
         ns = {'atom': 'http://www.w3.org/2005/Atom'}
         
         total_found = 0
         skipped = 0
+        new_found = 0
+        newest_id = None
+        unchanged = False
         
-        # Find all entry elements
-        for entry in root.findall('atom:entry', ns):
+        # Previous feed timestamp and entry watermark (ignored in force mode)
+        previous = {} if state is None or self.force else dict(state)
+        
+        for entry in entries:
+            # Feed-level timestamp precedes the entries; if it hasn't moved, nothing has
+            feed_updated = getattr(entries, 'updated', None)
+            if total_found == 0 and feed_updated and feed_updated == previous.get('updated'):
+                unchanged = True
+                break
+            
             total_found += 1
             
             # Extract data
@@ -58,6 +87,13 @@ class SansecScraper:
             # Create ID from URL - use just the slug without sansec- prefix
             url_slug = article['url'].split('/')[-1] if article['url'] else f"{total_found}"
             article['id'] = url_slug
+            newest_id = article['id']
+            
+            # Everything up to the previous run's newest entry is older
+            if article['id'] == previous.get('newest_id'):
+                articles.clear()
+                new_found = 0
+                continue
             
             # Check for duplicates - try both with and without sansec- prefix
             # (for backwards compatibility with different tracking methods)
@@ -90,21 +126,36 @@ class SansecScraper:
                 article['summary'] = unescape(summary.text) if summary is not None else ''
             
             articles.append(article)
+            new_found += 1
         
         # Reverse the list to get newest first (Atom feed is oldest-first)
-        articles.reverse()
+        articles = list(reversed(articles))
+        
+        if hasattr(entries, 'close'):
+            entries.close()
+        
+        # Remember where this feed was for the next run
+        if state is not None and not unchanged:
+            if getattr(entries, 'updated', None):
+                state['updated'] = entries.updated
+            if newest_id:
+                state['newest_id'] = newest_id
         
-        if total_found > 0:
+        if unchanged:
+            print(f"   ℹ️  Feed unchanged since {previous['updated']}, skipped")
+        elif total_found > 0:
             if skipped > 0:
                 print(f"   ℹ️  Skipped {skipped} existing articles (already in feed)")
+            if new_found > len(articles):
+                print(f"   ⚠️  Limited to {limit} most recent articles")
             print(f"   📥 Found {len(articles)} new articles to scrape")
         else:
             print(f"   ℹ️  No articles found")
         
         return articles
     
-    def create_markdown(self, data):
-        """Create markdown file with Micro.blog front matter"""
+    def render_markdown(self, data):
+        """Build the post path and markdown with Micro.blog front matter"""
         date = data['published_date']
         
         # Create slug from ID
@@ -112,7 +163,6 @@ class SansecScraper:
         
         # Create directory structure: YYYY/MM/DD/
         date_dir = self.output_dir / str(date.year) / f"{date.month:02d}" / f"{date.day:02d}"
-        date_dir.mkdir(parents=True, exist_ok=True)
         
         filename = date_dir / f"{slug}.md"
         
@@ -141,10 +191,17 @@ class SansecScraper:
         # Build content
         content_parts = []
         
-        # Add summary
+        # Add summary (the feed carries the full post; fall back to the fetched text)
         if data['summary']:
             content_parts.append(data['summary'])
             content_parts.append('')
+        elif data.get('article_text'):
+            content_parts.append(article_excerpt(data['article_text']))
+            content_parts.append('')
+        
+        if data.get('advisory_ids'):
+            content_parts.append(f"**Mentioned advisories:** {advisory_links(data['advisory_ids'])}")
+            content_parts.append('')
         
         # Link to full article
         content_parts.append(f"---\n")
@@ -152,76 +209,92 @@ class SansecScraper:
         
         content = '\n'.join(content_parts)
         
-        # Write file in Micro.blog format
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write('---\n')
-            for key, value in front_matter.items():
-                if isinstance(value, bool):
-                    f.write(f'{key}: {str(value).lower()}\n')
-                elif isinstance(value, list):
-                    f.write(f'{key}:\n')
-                    for item in value:
-                        f.write(f'  - {item}\n')
-                elif value is None or value == '':
-                    f.write(f'{key}: ""\n')
-                else:
-                    f.write(f'{key}: "{value}"\n')
-            f.write('---\n')
-            f.write(content)
-            f.write('\n')
-        
-        print(f"   ✓ Created: {filename}")
+        # Render in Micro.blog format
+        text = render_post(front_matter, content)
+        
+        return filename, text
+    
+    def create_markdown(self, data):
+        """Create markdown file with Micro.blog front matter"""
+        filename, text = self.render_markdown(data)
+        status = write_markdown(filename, text)
+        print(f"   {WRITE_LABELS[status]}: {filename}")
         return filename
     
-    def scrape(self, config):
-        """
-        Scrape articles from Sansec.io atom feed
+    def iter_fetched(self, config):
+        """Stream the source's feed and yield new articles with source info"""
+        print(f"\n🔍 Scraping {config.get('name', 'sansec')}...")
         
-        Config format:
-        {
-            'name': 'sansec-research',
-            'url': 'https://sansec.io/atom.xml',
-            'limit': 50,  # Optional: limit number of articles to fetch
-            'categories': []  # Optional categories to add
-        }
+        state = dict(self.feed_state.get(config['url'], {}))
+        for article in self.iter_feed_records(config['url'], config, state=state):
+            yield article
+    
+    def iter_feed_records(self, source, config, state=None):
+        """
+        Yield post records from the feed for one source config
+        `source` is the feed URL or raw feed bytes (e.g. a WebSub push);
+        `state` is the feed's stored state when polling, None for pushes.
         """
         source_name = config.get('name', 'sansec')
         limit = config.get('limit', 50)
         source_categories = config.get('categories', [])
         
-        print(f"\n🔍 Scraping {source_name}...")
-        
-        # Fetch the atom feed
-        root = self.fetch_feed(config['url'])
-        if root is None:
-            return []
-        
-        # Extract articles
-        articles = self.extract_articles(root)
+        # Stream the atom feed and keep the most recent articles
+        entries = self.fetch_feed(source)
+        articles = self.extract_articles(entries, limit=limit, state=state)
         
-        # Apply limit
-        if limit and len(articles) > limit:
-            articles = articles[:limit]
-            print(f"   ⚠️  Limited to {limit} most recent articles")
+        # Optionally fetch the linked articles for full text and advisory IDs
+        if config.get('enrich') and articles:
+            self.enricher.enrich(articles, config['enrich'])
         
-        created_files = []
+        # New articles are only tracked once posted, so the watermark moves on
+        # the first run that finds nothing new (they are known by then)
+        if state is not None and not articles and state != self.feed_state.get(config['url'], {}):
+            self.feed_state[config['url']] = state
+            self.feed_state_changed = True
         
-        # Process each article
         for article in articles:
             print(f"   Processing {article['id']}...")
             
             # Add source info to article for markdown generation
             article['source_name'] = source_name
             article['source_categories'] = source_categories
-            
-            # Create markdown
-            try:
-                filename = self.create_markdown(article)
-                created_files.append(filename)
-                # Track both the slug and the prefixed version for future runs
-                self.existing_posts.add(article['id'])
-                self.existing_posts.add(f"sansec-{article['id']}")
-            except Exception as e:
-                print(f"   ✗ Error creating markdown for {article['id']}: {e}")
-        
-        return created_files
+            yield article
+    
+    def parse_fetched(self, item):
+        """Feed entries are parsed while streaming"""
+        return [item]
+    
+    def iter_records(self, config):
+        """Generator of article post records"""
+        return iter_records(self, config)
+    
+    def mark_written(self, article, filename):
+        """Track both the slug and the prefixed version for future runs"""
+        self.existing_posts.add(article['id'])
+        self.existing_posts.add(f"sansec-{article['id']}")
+    
+    def finish_source(self, config, created_files):
+        """Save feed state once the source's posts are written"""
+        if self.feed_state_changed:
+            save_feed_state(self.tracking_file, self.feed_state)
+            self.feed_state_changed = False
+    
+    def process_feed(self, source, config, state=None):
+        """Turn a feed URL or raw feed bytes into posts; returns the created files"""
+        return write_records(self, self.iter_feed_records(source, config, state=state))
+    
+    def scrape(self, config):
+        """
+        Scrape articles from Sansec.io atom feed
+        
+        Config format:
+        {
+            'name': 'sansec-research',
+            'url': 'https://sansec.io/atom.xml',
+            'limit': 50,  # Optional: limit number of articles to fetch
+            'categories': [],  # Optional categories to add
+            'enrich': True  # Optional: fetch linked articles (or a dict of ArticleEnricher.DEFAULTS overrides)
+        }
+        """
+        return scrape_records(self, config)
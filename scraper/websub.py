@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+WebSub receiver for Atom sources
+Subscribes to the hubs advertised by atom-feed sources and turns pushed
+entries into posts through the same path as polling, so new articles are
+picked up seconds after they are published instead of on the next run.
+"""
+
+import hmac
+import time
+import queue
+import hashlib
+import secrets
+import argparse
+import threading
+import requests
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.etree import ElementTree as ET
+from scraper import ScraperCoordinator
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+# Wait before asking a hub again after a renewal it refused or never verified
+RENEW_RETRY_SECONDS = 300
+
+
+class WebSubReceiver:
+    def __init__(self, callback_base, hub=None, lease_seconds=86400, sources=None, post_limit=0,
+                 config_file='../data/sources.yaml', output_dir='../content'):
+        """Initialize receiver; callback_base is the public URL the hub can reach us on"""
+        self.callback_base = callback_base.rstrip('/')
+        self.hub_override = hub
+        self.lease_seconds = lease_seconds
+        self.source_filter = set(sources or [])
+        self.post_limit = post_limit
+        
+        # Reuse the coordinator's scrapers, config and existing post IDs
+        self.coordinator = ScraperCoordinator(config_file=config_file, output_dir=output_dir)
+        
+        # Subscriptions keyed by source name (also the callback path)
+        self.subscriptions = {}
+        self.pushes = queue.Queue()
+    
+    def discover_hub(self, feed_url):
+        """Find the hub and topic URLs a feed advertises (Link header or feed-level links)"""
+        try:
+            response = requests.get(feed_url, timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"   ✗ Error fetching {feed_url}: {e}")
+            return None, None
+        
+        hub = response.links.get('hub', {}).get('url')
+        topic = response.links.get('self', {}).get('url')
+        
+        if not hub or not topic:
+            try:
+                root = ET.fromstring(response.content)
+            except ET.ParseError as e:
+                print(f"   ✗ Error parsing {feed_url}: {e}")
+                return hub, topic or feed_url
+            
+            # Atom links sit on <feed>; RSS feeds carry atom:link inside <channel>
+            parent = root.find('channel') if root.tag == 'rss' else root
+            for link in parent.findall(f'{{{ATOM_NS}}}link') if parent is not None else []:
+                rel = link.get('rel')
+                if rel == 'hub' and not hub:
+                    hub = link.get('href')
+                elif rel == 'self' and not topic:
+                    topic = link.get('href')
+        
+        return hub, topic or feed_url
+    
+    def request_subscription(self, subscription, mode='subscribe'):
+        """Ask the hub to (un)subscribe our callback; the hub then verifies intent via GET"""
+        data = {
+            'hub.mode': mode,
+            'hub.topic': subscription['topic'],
+            'hub.callback': subscription['callback'],
+        }
+        if mode == 'subscribe':
+            data['hub.secret'] = subscription['secret']
+            data['hub.lease_seconds'] = str(self.lease_seconds)
+        
+        try:
+            response = requests.post(subscription['hub'], data=data, timeout=30)
+            if response.status_code in (202, 204):
+                print(f"   ✓ Requested {mode} for {subscription['topic']} at {subscription['hub']}")
+                return True
+            print(f"   ✗ Hub refused {mode} for {subscription['topic']}: {response.status_code} {response.text[:200]}")
+        except Exception as e:
+            print(f"   ✗ Error contacting hub {subscription['hub']}: {e}")
+        return False
+    
+    def subscribe_all(self):
+        """Subscribe every atom-feed source whose feed advertises a hub"""
+        for source in self.coordinator.load_config():
+            name = source.get('name')
+            if source.get('type') != 'atom-feed' or not source.get('url'):
+                continue
+            if self.source_filter and name not in self.source_filter:
+                continue
+            
+            print(f"\n🔍 Discovering hub for {name}...")
+            hub, topic = self.discover_hub(source['url'])
+            hub = self.hub_override or hub
+            if not hub:
+                print(f"   ℹ️  {name} does not advertise a WebSub hub, keep polling it")
+                continue
+            
+            subscription = {
+                'source': source,
+                'hub': hub,
+                'topic': topic,
+                'callback': f"{self.callback_base}/websub/{name}",
+                'secret': secrets.token_hex(20),
+                'verified': False,
+                'expires': None,
+                'retry_at': 0,
+            }
+            self.subscriptions[name] = subscription
+            self.request_subscription(subscription)
+        
+        return len(self.subscriptions)
+    
+    def verify_intent(self, name, params):
+        """Answer a hub's verification GET; returns the challenge to echo or None"""
+        subscription = self.subscriptions.get(name)
+        mode = params.get('hub.mode')
+        
+        if mode == 'denied':
+            print(f"   ✗ Hub denied subscription for {name}: {params.get('hub.reason', 'no reason given')}")
+            return None
+        if not subscription or params.get('hub.topic') != subscription['topic']:
+            return None
+        if mode not in ('subscribe', 'unsubscribe'):
+            return None
+        
+        if mode == 'subscribe':
+            lease = int(params.get('hub.lease_seconds') or self.lease_seconds)
+            subscription['verified'] = True
+            subscription['expires'] = time.time() + lease
+            subscription['retry_at'] = 0
+            print(f"   ✓ Subscription for {name} verified (lease {lease}s)")
+        else:
+            subscription['verified'] = False
+            print(f"   ✓ Unsubscribe for {name} verified")
+        return params.get('hub.challenge')
+    
+    def signature_valid(self, name, body, header):
+        """Check the X-Hub-Signature HMAC of a pushed body against our secret"""
+        subscription = self.subscriptions.get(name)
+        if not subscription or not header or '=' not in header:
+            return False
+        
+        method, signature = header.split('=', 1)
+        if method not in ('sha1', 'sha256', 'sha384', 'sha512'):
+            return False
+        expected = hmac.new(subscription['secret'].encode(), body, getattr(hashlib, method)).hexdigest()
+        return hmac.compare_digest(expected, signature.strip().lower())
+    
+    def process_push(self, name, body):
+        """Run pushed feed content through the same scraper path as polling"""
+        subscription = self.subscriptions[name]
+        source = subscription['source']
+        print(f"\n📨 Push received for {name} ({len(body)} bytes)")
+        
+        scraper = self.coordinator.get_scraper(source)
+        try:
+            files = scraper.process_feed(body, source)
+        except Exception as e:
+            print(f"   ✗ Error processing push for {name}: {e}")
+            return
+        
+        if files and self.post_limit:
+            from post_to_microblog import MicroblogPoster
+            try:
+                MicroblogPoster().run(limit=self.post_limit)
+            except Exception as e:
+                print(f"   ✗ Error posting pushed articles: {e}")
+    
+    def process_pushes(self):
+        """Worker: handle pushes one at a time so scrapers never run concurrently"""
+        while True:
+            name, body = self.pushes.get()
+            self.process_push(name, body)
+            self.pushes.task_done()
+    
+    def renew_due(self, margin):
+        """
+        Resubscribe every verified subscription whose lease ends within margin seconds
+        The old expiry is kept until the hub verifies the renewal (which sets the
+        new one), so a refused or unverified renewal is retried after RENEW_RETRY_SECONDS.
+        """
+        now = time.time()
+        for subscription in self.subscriptions.values():
+            expires = subscription['expires']
+            if not subscription['verified'] or not expires or expires - now >= margin:
+                continue
+            if subscription.get('retry_at', 0) > now:
+                continue
+            print(f"\n🔄 Renewing lease for {subscription['topic']}")
+            subscription['retry_at'] = now + RENEW_RETRY_SECONDS
+            if not self.request_subscription(subscription):
+                print(f"   ℹ️  Keeping the current lease, retrying in {RENEW_RETRY_SECONDS}s")
+    
+    def renew_leases(self, interval=60):
+        """Worker: resubscribe before leases run out"""
+        while True:
+            time.sleep(interval)
+            self.renew_due(max(self.lease_seconds * 0.1, interval * 2))
+    
+    def make_handler(self):
+        """Build the HTTP request handler bound to this receiver"""
+        receiver = self
+        
+        class CallbackHandler(BaseHTTPRequestHandler):
+            def subscription_name(self):
+                parts = urlparse(self.path).path.strip('/').split('/')
+                if len(parts) == 2 and parts[0] == 'websub' and parts[1] in receiver.subscriptions:
+                    return parts[1]
+                return None
+            
+            def reply(self, status, body=b''):
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                name = self.subscription_name()
+                params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                challenge = receiver.verify_intent(name, params) if name else None
+                if challenge is None:
+                    self.reply(404)
+                else:
+                    self.reply(200, challenge.encode())
+            
+            def do_POST(self):
+                name = self.subscription_name()
+                if not name:
+                    self.reply(404)
+                    return
+                
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                # Per spec, unsigned or mis-signed content is acknowledged but ignored
+                if receiver.signature_valid(name, body, self.headers.get('X-Hub-Signature')):
+                    receiver.pushes.put((name, body))
+                else:
+                    print(f"   ⚠️  Ignoring push for {name} with missing or invalid signature")
+                self.reply(202)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return CallbackHandler
+    
+    def unsubscribe_all(self):
+        """Tell hubs we are going away"""
+        for subscription in self.subscriptions.values():
+            self.request_subscription(subscription, mode='unsubscribe')
+    
+    def run(self, host='0.0.0.0', port=8080):
+        """Start the callback server, subscribe, and handle pushes until interrupted"""
+        print("🚀 Adobe Digest WebSub Receiver")
+        print("=" * 50)
+        
+        server = ThreadingHTTPServer((host, port), self.make_handler())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"📡 Listening on {host}:{server.server_address[1]}, callbacks at {self.callback_base}/websub/<source>")
+        
+        if not self.subscribe_all():
+            print("\nℹ️  No sources advertise a WebSub hub, nothing to do")
+            server.shutdown()
+            return
+        
+        threading.Thread(target=self.process_pushes, daemon=True).start()
+        threading.Thread(target=self.renew_leases, daemon=True).start()
+        
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n👋 Shutting down")
+            self.unsubscribe_all()
+            server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Receive WebSub pushes for atom-feed sources')
+    parser.add_argument('--callback', required=True, help='Public base URL hubs can reach this receiver on')
+    parser.add_argument('--host', default='0.0.0.0', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on')
+    parser.add_argument('--config', default='../data/sources.yaml', help='Sources file (relative to scraper/)')
+    parser.add_argument('--hub', help='Use this hub for every source (e.g. a local stand-in hub)')
+    parser.add_argument('--source', action='append', help='Only subscribe this source (repeatable)')
+    parser.add_argument('--lease-seconds', type=int, default=86400, help='Requested subscription lease')
+    parser.add_argument('--post', type=int, default=0, metavar='LIMIT', help='Publish up to LIMIT posts to Micro.blog after each push')
+    
+    args = parser.parse_args()
+    
+    receiver = WebSubReceiver(
+        args.callback,
+        hub=args.hub,
+        lease_seconds=args.lease_seconds,
+        sources=args.source,
+        post_limit=args.post,
+        config_file=args.config
+    )
+    receiver.run(host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()